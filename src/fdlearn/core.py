@@ -10,6 +10,7 @@ from .learning.candidate import (
     ConstraintCandidate,
     FandangoConstraintCandidate,
     CandidateSet,
+    InputRegistry,
 )
 from .data import FandangoInput, OracleResult
 from .learning.metric import FitnessStrategy, RecallPriorityFitness
@@ -94,6 +95,8 @@ class BaseFandangoLearner(PatternCandidateLearner, ABC):
         self.sorting_strategy = sorting_strategy
 
         self.candidates: CandidateSet = CandidateSet()
+        # The inputs the candidates of this learner are evaluated on
+        self.registry: InputRegistry = InputRegistry()
 
     def parse_patterns(self, patterns):
         """
@@ -163,6 +166,7 @@ class BaseFandangoLearner(PatternCandidateLearner, ABC):
         Minimum precision and recall values are not reset.
         """
         self.candidates = CandidateSet()
+        self.registry = InputRegistry()
 
     @abstractmethod
     def learn_constraints(
@@ -183,10 +187,10 @@ class BaseFandangoLearner(PatternCandidateLearner, ABC):
         """
         Categorize the inputs into positive and negative inputs based on their oracle results.
         """
-        positive_inputs = {
-            inp for inp in test_inputs if inp.oracle == OracleResult.FAILING
-        }
-        negative_inputs = {
-            inp for inp in test_inputs if inp.oracle == OracleResult.PASSING
-        }
+        positive_inputs, negative_inputs = set(), set()
+        for inp in test_inputs:
+            if inp.oracle is OracleResult.FAILING:
+                positive_inputs.add(inp)
+            elif inp.oracle is OracleResult.PASSING:
+                negative_inputs.add(inp)
         return positive_inputs, negative_inputs
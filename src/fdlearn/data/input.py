@@ -6,10 +6,11 @@ For Fandango, we use the provided Derivation tree implementation.
 """
 
 from abc import ABC, abstractmethod
-from typing import Generator, Optional, Final
+from typing import Callable, Generator, Iterable, Optional, Final, Set
 
 from fandango.language.tree import DerivationTree
 from fandango.language.grammar import Grammar
+from fandango.language.symbol import NonTerminal
 
 from fdlearn.data.oracle import OracleResult
 from fdlearn.reduction.feature_class import FeatureVector
@@ -22,6 +23,8 @@ class Input(ABC):
     provides the outcome when this input is processed by a system under test.
     """
 
+    __slots__ = ("tree", "oracle", "features")
+
     def __init__(self, tree: DerivationTree, oracle: OracleResult = None):
         """
         Initializes the Input instance with a derivation tree and an optional oracle result.
@@ -32,49 +35,9 @@ class Input(ABC):
         assert isinstance(
             tree, DerivationTree
         ), f"tree must be an instance of DerivationTree, but is {type(tree)}"
-        self.__tree: Final[DerivationTree] = tree
-        self.__oracle: Optional[OracleResult] = oracle
-        self.__features: Optional[FeatureVector] = None
-
-    @property
-    def tree(self) -> DerivationTree:
-        """
-        Retrieves the derivation tree of the input.
-        :return DerivationTree: The derivation tree.
-        """
-        return self.__tree
-
-    @property
-    def oracle(self) -> OracleResult:
-        """
-        Retrieves the oracle result associated with the input.
-        :return OracleResult: The oracle result, or None if not set.
-        """
-        return self.__oracle
-
-    @property
-    def features(self) -> FeatureVector:
-        """
-        Retrieves the features associated with the input.
-        :return: The features associated with the input.
-        """
-        return self.__features
-
-    @oracle.setter
-    def oracle(self, oracle_: OracleResult):
-        """
-        Sets the oracle result for the input.
-        :param OracleResult oracle_: The new oracle result to set.
-        """
-        self.__oracle = oracle_
-
-    @features.setter
-    def features(self, features_: FeatureVector):
-        """
-        Sets the features for the input.
-        :param FeatureVector features_: The new features to set.
-        """
-        self.__features = features_
+        self.tree: Final[DerivationTree] = tree
+        self.oracle: Optional[OracleResult] = oracle
+        self.features: Optional[FeatureVector] = None
 
     def update_oracle(self, oracle_: OracleResult) -> "Input":
         """
@@ -82,7 +45,7 @@ class Input(ABC):
         :param OracleResult oracle_: The new oracle result to set.
         :return Input: The current input instance with the updated oracle.
         """
-        self.__oracle = oracle_
+        self.oracle = oracle_
         return self
 
     def update_features(self, features_: FeatureVector) -> "Input":
@@ -91,7 +54,7 @@ class Input(ABC):
         :param FeatureVector features_: The new features to set.
         :return Input: The current input instance with the updated features.
         """
-        self.__features = features_
+        self.features = features_
         return self
 
     def __repr__(self) -> str:
@@ -106,7 +69,7 @@ class Input(ABC):
         Provides a user-friendly string representation of the Input's derivation tree.
         :return str: The string representation of the derivation tree.
         """
-        return str(self.__tree)
+        return str(self.tree)
 
     @abstractmethod
     def __hash__(self) -> int:
@@ -162,16 +125,42 @@ class FandangoInput(Input):
     An Input instance representing a test input for the Fandango language.
     """
 
+    __slots__ = ("_hash", "_non_terminals")
+
     def __init__(self, tree: DerivationTree, oracle: Optional[OracleResult] = None):
         super().__init__(tree, oracle)
-        self.hash = hash(self.tree)
+        self._hash = hash(tree)
+        self._non_terminals: Optional[frozenset[NonTerminal]] = None
+
+    def get_non_terminal_symbols(self) -> frozenset[NonTerminal]:
+        """
+        Retrieves the non-terminal symbols occurring in the derivation tree.
+        The symbols are computed on first access and cached afterwards.
+        :return frozenset[NonTerminal]: The non-terminal symbols of the tree.
+        """
+        if self._non_terminals is None:
+            self._non_terminals = frozenset(self.tree.get_non_terminal_symbols())
+        return self._non_terminals
 
     def __hash__(self) -> int:
         """
         Generates a hash based on the structural hash of the derivation tree.
         :return:
         """
-        return self.hash
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        """
+        Determines equality based on the precomputed hashes of the derivation trees.
+        Only if the hashes are equal, the trees are compared, so inputs with colliding hashes stay apart.
+        :param other: The object to compare against.
+        :return bool: True if the other object is an input with an equal derivation tree.
+        """
+        if isinstance(other, FandangoInput):
+            return self._hash == other._hash and (
+                self.tree is other.tree or self.tree == other.tree
+            )
+        return super().__eq__(other)
 
     @classmethod
     def from_str(
@@ -188,12 +177,29 @@ class FandangoInput(Input):
         :return: The created Input instance.
         """
         tree = grammar.parse(input_string)
+        if not tree:
+            raise SyntaxError(f"Could not parse input_string '{input_string}'.")
         if isinstance(oracle, bool):
             oracle = OracleResult.FAILING if oracle else OracleResult.PASSING
-        if tree:
-            return cls(
-                grammar.parse(input_string),
-                oracle,
-            )
-        else:
-            raise SyntaxError(f"Could not parse input_string '{input_string}'.")
+        return cls(tree, oracle)
+
+    @classmethod
+    def from_str_batch(
+        cls,
+        grammar: Grammar,
+        input_strings: Iterable[str],
+        oracle: Optional[Callable[[str], OracleResult | bool]] = None,
+    ) -> Set["FandangoInput"]:
+        """
+        Factory method to create a set of Input instances from strings using the specified grammar.
+        Duplicate strings are parsed (and passed to the oracle) only once.
+        :param grammar: The grammar used for parsing the input strings.
+        :param input_strings: The input strings to parse.
+        :param oracle: An optional oracle that labels each input string.
+        :return: The set of created Input instances.
+        """
+        from_str = cls.from_str
+        unique_strings = dict.fromkeys(input_strings)
+        if oracle is None:
+            return {from_str(grammar, inp) for inp in unique_strings}
+        return {from_str(grammar, inp, oracle(inp)) for inp in unique_strings}
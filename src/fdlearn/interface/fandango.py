@@ -1,6 +1,8 @@
+import functools
+import hashlib
+import io
 import logging
-import tempfile
-import os
+import pickle
 
 from fandango.constraints.base import Constraint
 from fandango.language.parse import (
@@ -10,17 +12,23 @@ from fandango.language.parse import (
 
 
 def parse(
-    file_path, disable_logging=True, use_cache=True,use_stdlib=False, **kwargs
+    file_path, disable_logging=True, use_cache=True, use_stdlib=False, **kwargs
 ) -> tuple[Grammar | None, list[Constraint]]:
     """
     Wrapper for the parse function from fandango.language.parse
+    Accepts either a path or an open (text) file-like object.
     """
     if disable_logging:
         logging.getLogger("fandango").disabled = True
-    file = open(file_path, "r")
-    grammar, constraints = fandango_parse(
-        file, use_stdlib=use_stdlib, use_cache=use_cache, **kwargs
-    )
+    if hasattr(file_path, "read"):
+        grammar, constraints = fandango_parse(
+            file_path, use_stdlib=use_stdlib, use_cache=use_cache, **kwargs
+        )
+    else:
+        with open(file_path, "r") as file:
+            grammar, constraints = fandango_parse(
+                file, use_stdlib=use_stdlib, use_cache=use_cache, **kwargs
+            )
     assert isinstance(constraints, list), "Expected a list of constraints"
     assert all(
         isinstance(constraint, Constraint) for constraint in constraints
@@ -55,16 +63,62 @@ def parse_contents(
 ) -> tuple[Grammar | None, list[Constraint]]:
     """
     Wrapper for the parse_contents function from fandango.language.parse
+    Results are cached in memory (unless use_cache=False). Every call returns its own copy of the grammar and
+    constraints, so changes made by one caller do not leak into the next.
+    """
+    options = tuple(sorted(kwargs.items()))
+    if kwargs.get("use_cache", True) and _is_hashable(options):
+        try:
+            parsed = _parse_contents_cached(
+                content, disable_logging, use_stdlib, options
+            )
+        except _UnpicklableResult as e:
+            return e.result
+        return pickle.loads(parsed)
+    return _parse_contents(content, disable_logging, use_stdlib, **kwargs)
+
+
+def _parse_contents(
+    content: str, disable_logging: bool, use_stdlib: bool, **kwargs
+) -> tuple[Grammar | None, list[Constraint]]:
+    stream = io.StringIO(content)
+    # fandango reports by file name, so every content gets a name of its own
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+    stream.name = f"<string-{digest}>"
+    return parse(
+        stream, disable_logging=disable_logging, use_stdlib=use_stdlib, **kwargs
+    )
+
+
+class _UnpicklableResult(Exception):
     """
-    with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-        tmp_file.write(content.encode("utf-8"))
-        tmp_file_path = tmp_file.name
+    Carries a parse result that cannot be pickled out of the cache, which does not store exceptions.
+    """
+
+    def __init__(self, result: tuple[Grammar | None, list[Constraint]]):
+        super().__init__()
+        self.result = result
+
 
+@functools.lru_cache(maxsize=128)
+def _parse_contents_cached(
+    content: str, disable_logging: bool, use_stdlib: bool, options: tuple
+) -> bytes:
+    """
+    Parse the contents and return the pickled result.
+    Raises _UnpicklableResult with the parsed result if it cannot be pickled, so that it is neither cached nor
+    parsed again.
+    """
+    result = _parse_contents(content, disable_logging, use_stdlib, **dict(options))
     try:
-        grammar, constraints = parse(
-            tmp_file_path, disable_logging=disable_logging,use_stdlib=use_stdlib, **kwargs
-        )
-    finally:
-        os.remove(tmp_file_path)
+        return pickle.dumps(result)
+    except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+        raise _UnpicklableResult(result)
 
-    return grammar, constraints
+
+def _is_hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
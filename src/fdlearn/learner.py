@@ -1,11 +1,12 @@
-from typing import List, Iterable, Optional, Set, Callable
-import os
+from typing import List, Iterable, Iterator, Optional, Set, Callable
+import io
+import heapq
 import contextlib
 
 from fandango.language.grammar import Grammar
 from fandango.language.symbol import NonTerminal
 
-from .learning.candidate import FandangoConstraintCandidate
+from .learning.candidate import FandangoConstraintCandidate, batch_counts
 from .data import FandangoInput, OracleResult
 from .logger import LOGGER, LoggerLevel
 from .learning.combination import ConjunctionProcessor, DisjunctionProcessor
@@ -16,6 +17,20 @@ from .resources.patterns import Pattern
 from .reduction.feature_class import get_direct_reachability_map
 
 
+class _NullStream(io.TextIOBase):
+    """
+    A text stream that discards everything written to it.
+    """
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+NULL_STREAM = _NullStream()
+
 class FandangoLearner(BaseFandangoLearner):
     """
     A candidate learner that learns fandango constraints based on patterns from a pattern repository.
@@ -28,6 +43,7 @@ class FandangoLearner(BaseFandangoLearner):
         logger_level: LoggerLevel = LoggerLevel.INFO,
         max_conjunction_size=2,
         use_all_non_terminals=False,
+        workers: int = 1,
         **kwargs,
     ):
         """
@@ -36,6 +52,7 @@ class FandangoLearner(BaseFandangoLearner):
         Args:
             grammar (Grammar): The grammar used for parsing and learning constraints.
             patterns (Optional[Iterable[str]]): A collection of patterns to be used in the learning process.
+            workers (int): The number of processes used to instantiate the patterns and to compute the conjunctions.
             **kwargs: Additional arguments for customization.
         """
 
@@ -47,11 +64,15 @@ class FandangoLearner(BaseFandangoLearner):
         self.max_disjunction_size = 2
         self.positive_learning_size = 5
         self.use_all_non_terminals = use_all_non_terminals
+        self.workers = workers
 
-        self.pattern_processor = PatternProcessor(self.patterns)
+        self.pattern_processor = PatternProcessor(self.patterns, workers=workers)
 
         self.conjunction_processor = ConjunctionProcessor(
-            self.max_conjunction_size, self.min_precision, self.min_recall
+            self.max_conjunction_size,
+            self.min_precision,
+            self.min_recall,
+            workers=workers,
         )
         self.disjunction_processor = DisjunctionProcessor(
             self.max_disjunction_size, self.min_precision, self.min_recall
@@ -60,7 +81,7 @@ class FandangoLearner(BaseFandangoLearner):
         # Refinement
         self.all_positive_inputs = set()
         self.all_negative_inputs = set()
-        self.removed_candidates = set()
+        self.removed_candidates: set[int] = set()
 
     def learn_constraints(
         self,
@@ -84,8 +105,8 @@ class FandangoLearner(BaseFandangoLearner):
         if any(isinstance(inp, str) for inp in test_inputs):
             test_inputs = self.parse_string_initial_inputs(test_inputs, oracle)
 
-        relevant_non_terminals = self.get_relevant_non_terminals(
-            relevant_non_terminals, test_inputs
+        relevant_non_terminals = frozenset(
+            self.get_relevant_non_terminals(relevant_non_terminals, test_inputs)
         )
 
         positive_inputs, negative_inputs = self.categorize_inputs(test_inputs)
@@ -101,25 +122,27 @@ class FandangoLearner(BaseFandangoLearner):
         reachability_map = get_direct_reachability_map(self.grammar)
 
         instantiated_candidates = self.pattern_processor.instantiate_patterns(
-            relevant_non_terminals, sorted_positive_inputs, value_maps=value_maps, reachability_map=reachability_map
+            relevant_non_terminals,
+            sorted_positive_inputs,
+            value_maps=value_maps,
+            reachability_map=reachability_map,
+            registry=self.registry,
         )
 
-        candidates_to_evaluate: List[FandangoConstraintCandidate] = (
-            [] + self.candidates.candidates
+        LOGGER.info(
+            "Evaluating %s candidates and %s instantiated patterns",
+            len(self.candidates),
+            len(instantiated_candidates),
         )
-        for candidate in instantiated_candidates - self.removed_candidates:
-            if candidate not in self.candidates:
-                candidates_to_evaluate.append(candidate)
-
-        LOGGER.info("Evaluating %s candidates", len(candidates_to_evaluate))
         self.validate_and_add_new_candidates(
-            candidates_to_evaluate, positive_inputs, negative_inputs
+            self.get_candidates_to_evaluate(instantiated_candidates),
+            positive_inputs,
+            negative_inputs,
         )
 
         LOGGER.info(f"Calculating combinations for {len(self.candidates)} candidates")
         conjunction_candidates = self.conjunction_processor.process(self.candidates)
-        for candidate in conjunction_candidates:
-            self.candidates.append(candidate)
+        self.candidates.extend(conjunction_candidates)
 
         # disjunction_candidates = self.disjunction_processor.process(self.candidates)
         # for candidate in disjunction_candidates:
@@ -143,16 +166,14 @@ class FandangoLearner(BaseFandangoLearner):
         Returns:
             Set[FandangoInput]: A set of FandangoInput objects.
         """
-        return {
-            FandangoInput.from_str(self.grammar, inp, oracle=oracle(inp))
-            for inp in initial_inputs
-        }
+        return FandangoInput.from_str_batch(self.grammar, initial_inputs, oracle)
 
     def sort_and_filter_positive_inputs(
         self, positive_inputs: Set[FandangoInput]
     ) -> Set[FandangoInput]:
         """
         Filters and sorts positive inputs for learning.
+        The smallest inputs are selected, as they are the most likely to be free of unrelated structure.
 
         Args:
             positive_inputs (Set[FandangoInput]): A set of positive inputs.
@@ -160,7 +181,13 @@ class FandangoLearner(BaseFandangoLearner):
         Returns:
             Set[FandangoInput]: A filtered subset of positive inputs.
         """
-        filtered_inputs = set(list(positive_inputs)[: self.positive_learning_size])
+        filtered_inputs = set(
+            heapq.nsmallest(
+                self.positive_learning_size,
+                positive_inputs,
+                key=lambda inp: len(str(inp.tree)),
+            )
+        )
         LOGGER.info("Filtered positive inputs for learning: %s", len(filtered_inputs))
         return filtered_inputs
 
@@ -170,9 +197,30 @@ class FandangoLearner(BaseFandangoLearner):
         self.all_positive_inputs.update(positive_inputs)
         self.all_negative_inputs.update(negative_inputs)
 
+    def get_candidates_to_evaluate(
+        self, instantiated_candidates: Iterable[FandangoConstraintCandidate]
+    ) -> Iterator[FandangoConstraintCandidate]:
+        """
+        Yields the current candidates followed by the instantiated candidates that are neither known nor removed.
+
+        Args:
+            instantiated_candidates (Iterable[FandangoConstraintCandidate]): The newly instantiated candidates.
+
+        Returns:
+            Iterator[FandangoConstraintCandidate]: The candidates to evaluate.
+        """
+        # Snapshot the current candidates, since the validation removes candidates from the set
+        yield from tuple(self.candidates)
+        for candidate in instantiated_candidates:
+            if (
+                hash(candidate) not in self.removed_candidates
+                and candidate not in self.candidates
+            ):
+                yield candidate
+
     def validate_and_add_new_candidates(
         self,
-        candidates: List[FandangoConstraintCandidate],
+        candidates: Iterable[FandangoConstraintCandidate],
         positive_inputs: Set[FandangoInput],
         negative_inputs: Set[FandangoInput],
     ) -> None:
@@ -180,7 +228,7 @@ class FandangoLearner(BaseFandangoLearner):
         Generates constraint candidates based on instantiated patterns and evaluates them.
 
         Args:
-            candidates (Set[FandangoConstraintCandidate]): A set of new candidates.
+            candidates (Iterable[FandangoConstraintCandidate]): The candidates to validate.
             positive_inputs (Set[FandangoInput]): A set of positive inputs.
             negative_inputs (Set[FandangoInput]): A set of negative inputs.
         """
@@ -192,13 +240,13 @@ class FandangoLearner(BaseFandangoLearner):
                     self.candidates.append(candidate)
                     LOGGER.debug("Added new candidate: %s", candidate)
                 else:
-                    self.removed_candidates.add(candidate)
+                    self.removed_candidates.add(hash(candidate))
             else:
                 if not self.evaluate_candidate(
                     candidate, positive_inputs, negative_inputs
                 ):
                     self.candidates.remove(candidate)
-                    self.removed_candidates.add(candidate)
+                    self.removed_candidates.add(hash(candidate))
 
     def evaluate_candidate(
         self, candidate: FandangoConstraintCandidate, positive_inputs, negative_inputs
@@ -216,11 +264,8 @@ class FandangoLearner(BaseFandangoLearner):
             bool: True if the candidate is valid, False otherwise.
         """
         try:
-            # Redirect sys.stderr to a null file during the call, Fandango allways prints to stderr
-            with (
-                open(os.devnull, "w") as null_file,
-                contextlib.redirect_stderr(null_file),
-            ):
+            # Redirect sys.stderr during the call, Fandango allways prints to stderr
+            with contextlib.redirect_stderr(NULL_STREAM):
                 candidate.evaluate(positive_inputs)
                 if candidate.recall() >= self.min_recall:
                     candidate.evaluate(negative_inputs)
@@ -237,6 +282,7 @@ class FandangoLearner(BaseFandangoLearner):
         Candidates with specificity or recall below the defined thresholds are removed.
         This method is called after the learning process to refine the candidate set.
         """
+        batch_counts(self.candidates.candidates)
         candidates_to_remove = [
             candidate
             for candidate in self.candidates
@@ -288,7 +334,6 @@ class FandangoLearner(BaseFandangoLearner):
         non_terminals = set()
         for inp in test_inputs:
             if inp.oracle.is_failing():
-                tree = inp.tree
-                non_terminals.update(tree.get_non_terminal_symbols())
+                non_terminals.update(inp.get_non_terminal_symbols())
 
         return non_terminals
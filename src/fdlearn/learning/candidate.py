@@ -1,15 +1,279 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Tuple
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
+import numpy as np
 from fandango.constraints.base import (
     Constraint,
+    ComparisonConstraint,
     ConjunctionConstraint,
     DisjunctionConstraint,
 )
+from fandango.language.search import RuleSearch
+from fandango.language.tree import DerivationTree
+from fandango.language.symbol import NonTerminal
 
 from fdlearn.data import FandangoInput, OracleResult
 from fdlearn.language.constraints import NegationConstraint
 
+BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(mask: np.ndarray) -> int:
+    """
+    Return the number of set bits in a packed bitset.
+    Without np.bitwise_count (NumPy < 2.0), the bits are counted per byte with a lookup table.
+    """
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(mask).sum())
+    return int(BYTE_POPCOUNT[mask.view(np.uint8)].sum(dtype=np.int64))
+
+
+def popcount_rows(masks: np.ndarray) -> np.ndarray:
+    """
+    Return the number of set bits in every row of a matrix of packed bitsets.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+    return BYTE_POPCOUNT[masks.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def resize_mask(mask: np.ndarray, num_words: int) -> np.ndarray:
+    """
+    Return the bitset padded with zero words to (at least) the given number of words.
+    """
+    if len(mask) >= num_words:
+        return mask
+    return np.concatenate((mask, np.zeros(num_words - len(mask), dtype=np.uint64)))
+
+
+def align_masks(*masks: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Pad all bitsets to the same number of words.
+    """
+    num_words = max(len(mask) for mask in masks)
+    return tuple(resize_mask(mask, num_words) for mask in masks)
+
+
+def set_bits(mask: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Return the bitset with the bits of the given ids set.
+    """
+    if len(ids) == 0:
+        return mask
+    mask = resize_mask(mask, int(ids.max() >> 6) + 1).copy()
+    np.bitwise_or.at(
+        mask, ids >> 6, np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64))
+    )
+    return mask
+
+
+def mask_ids(mask: np.ndarray) -> np.ndarray:
+    """
+    Return the ids of all set bits in a packed bitset, in ascending order.
+    """
+    return np.flatnonzero(
+        np.unpackbits(mask.astype("<u8").view(np.uint8), bitorder="little")
+    )
+
+
+def check_bits(mask: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Return a boolean array telling for each id whether its bit is set.
+    """
+    words = ids >> 6
+    result = np.zeros(len(ids), dtype=bool)
+    in_range = words < len(mask)
+    shifts = (ids[in_range] & 63).astype(np.uint64)
+    result[in_range] = (mask[words[in_range]] >> shifts) & np.uint64(1) == 1
+    return result
+
+
+def required_non_terminals(constraint: Constraint) -> Optional[frozenset[NonTerminal]]:
+    """
+    Return the non-terminals a comparison constraint searches for, if it only uses plain rule searches.
+    Such a constraint holds vacuously on every input that lacks one of these non-terminals, as there is
+    nothing to compare. For all other constraints, None is returned.
+    """
+    if not isinstance(constraint, ComparisonConstraint) or not constraint.searches:
+        return None
+    searches = constraint.searches.values()
+    if not all(type(search) is RuleSearch for search in searches):
+        return None
+    return frozenset(search.symbol for search in searches)
+
+
+class EvaluationCache:
+    """
+    A bounded LRU cache of constraint evaluations, keyed by the constraint string and the id of the input in its
+    InputRegistry. It is shared by all candidates of a registry, so that candidates with the same constraint (e.g.,
+    recreated or reset candidates) do not check the same input twice.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16):
+        self.maxsize = maxsize
+        self.results: OrderedDict[Tuple[str, int], bool] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def check(
+        self, constraint_str: str, constraint: Constraint, inp: FandangoInput, idx: int
+    ) -> bool:
+        """
+        Return whether the input satisfies the constraint, checking it only if the result is not cached.
+        """
+        key = (constraint_str, idx)
+        result = self.results.get(key)
+        if result is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = bool(constraint.check(inp.tree))
+        self.results[key] = result
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class InputRegistry:
+    """
+    Assigns every input a dense integer id, so that the evaluation results of the candidates can be stored as
+    packed bitsets (one bit per input) and combined with vectorized bitwise operations.
+    Structurally equal inputs share one id, and thus a single evaluation per candidate, even if they are distinct
+    objects. Ids are looked up by the precomputed hash of the input; inputs whose hashes collide but whose trees
+    differ get ids of their own.
+    The failing bits follow the current oracle of the inputs: they are refreshed whenever inputs are passed to
+    ids_of, and every change increments the version, which invalidates the cached counts of the candidates.
+    Each learner owns a registry; candidates created without one use the module-level INPUT_REGISTRY.
+    """
+
+    def __init__(self):
+        self.ids: Dict[int, int] = {}
+        self.collisions: Dict[DerivationTree, int] = {}
+        self.inputs: List[FandangoInput] = []
+        self.failing: np.ndarray = np.zeros(0, dtype=np.uint64)
+        self.version: int = 0
+        self.evaluation_cache = EvaluationCache()
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def reset(self):
+        """
+        Forget all inputs and cached evaluations. Candidates evaluated on this registry have to be reset as well.
+        """
+        self.ids.clear()
+        self.collisions.clear()
+        self.inputs.clear()
+        self.failing = np.zeros(0, dtype=np.uint64)
+        self.version += 1
+        self.evaluation_cache.clear()
+
+    def _lookup(self, key: int, inp: FandangoInput) -> Optional[int]:
+        idx = self.ids.get(key)
+        if idx is None:
+            return None
+        known = self.inputs[idx]
+        if known is inp or known.tree == inp.tree:
+            return idx
+        return self.collisions.get(inp.tree)
+
+    def _register(self, key: int, inp: FandangoInput) -> int:
+        idx = len(self.inputs)
+        self.inputs.append(inp)
+        if key in self.ids:
+            self.collisions[inp.tree] = idx
+        else:
+            self.ids[key] = idx
+        return idx
+
+    def id_of(self, inp: FandangoInput) -> int:
+        """
+        Return the id of the input, registering it if it is new.
+        """
+        return int(self.ids_of([inp])[0])
+
+    def ids_of(self, inputs: Iterable[FandangoInput]) -> np.ndarray:
+        """
+        Return the ids of the inputs, registering the new ones.
+        The failing bits of the inputs are updated from their current oracles at once, without branching on each
+        oracle.
+        """
+        inputs = list(inputs)
+        lookup, register = self._lookup, self._register
+        id_list = []
+        for inp in inputs:
+            key = hash(inp)
+            idx = lookup(key, inp)
+            id_list.append(register(key, inp) if idx is None else idx)
+        ids = np.array(id_list, dtype=np.int64)
+
+        failing = np.fromiter(
+            (inp.oracle is OracleResult.FAILING for inp in inputs),
+            dtype=bool,
+            count=len(inputs),
+        )
+        changed = failing != check_bits(self.failing, ids)
+        if changed.any():
+            # Flip the bits of the inputs whose label differs from the stored one
+            flips = set_bits(np.zeros(0, dtype=np.uint64), ids[changed])
+            stored, flips = align_masks(self.failing, flips)
+            self.failing = stored ^ flips
+            self.version += 1
+        return ids
+
+    def get(self, inp: FandangoInput) -> Optional[int]:
+        """
+        Return the id of the input, or None if it is not registered.
+        """
+        return self._lookup(hash(inp), inp)
+
+
+INPUT_REGISTRY = InputRegistry()
+
+
+def batch_counts(candidates: List["FandangoConstraintCandidate"]) -> np.ndarray:
+    """
+    Compute the evaluation counts of all candidates at once on their stacked bitsets, and cache them on the
+    candidates. Returns an array with one row (num_failing, num_passing, tp, fp) per candidate.
+    """
+    if not candidates:
+        return np.zeros((0, 4), dtype=np.int64)
+    *masks, failing = align_masks(
+        *(candidate.evaluated for candidate in candidates),
+        *(candidate.satisfied for candidate in candidates),
+        candidates[0].registry.failing,
+    )
+    masks = np.stack(masks)
+    evaluated, satisfied = masks[: len(candidates)], masks[len(candidates) :]
+
+    num_failing = popcount_rows(evaluated & failing)
+    tp = popcount_rows(satisfied & failing)
+    counts = np.stack(
+        (
+            num_failing,
+            popcount_rows(evaluated) - num_failing,
+            tp,
+            popcount_rows(satisfied) - tp,
+        ),
+        axis=1,
+    )
+    version = candidates[0].registry.version
+    for candidate, row in zip(candidates, counts.tolist()):
+        candidate._cached_counts = tuple(row)
+        candidate._counts_version = version
+    return counts
+
 
 class ConstraintCandidate(ABC):
     """
@@ -48,20 +312,34 @@ class FandangoConstraintCandidate(ConstraintCandidate):
     """
     Represents a learned candidate constraint of the Fandango learner.
     This class encapsulates a constraint and provides methods for evaluating the constraint fast and efficiently.
+    The evaluation results are stored as two packed bitsets over the ids of an InputRegistry: the inputs the
+    candidate has been evaluated on, and the inputs that satisfy the constraint.
     """
 
     def __init__(
         self,
         constraint: Constraint,
-        failing_inputs_eval_results: Optional[List[bool]] = None,
-        passing_inputs_eval_results: Optional[List[bool]] = None,
-        cache: Optional[Dict[FandangoInput, bool]] = None,
+        evaluated: Optional[np.ndarray] = None,
+        satisfied: Optional[np.ndarray] = None,
+        registry: Optional[InputRegistry] = None,
     ):
         super().__init__(constraint)
-        self.failing_inputs_eval_results = failing_inputs_eval_results or []
-        self.passing_inputs_eval_results = passing_inputs_eval_results or []
-        self.cache: Dict[FandangoInput, bool] = cache or {}
-        self.__hash = hash(str(self.constraint))
+        self.registry: InputRegistry = (
+            registry if registry is not None else INPUT_REGISTRY
+        )
+        self.evaluated: np.ndarray = (
+            evaluated if evaluated is not None else np.zeros(0, dtype=np.uint64)
+        )
+        self.satisfied: np.ndarray = (
+            satisfied if satisfied is not None else np.zeros(0, dtype=np.uint64)
+        )
+        self.constraint_str: str = str(self.constraint)
+        self.__hash = hash(self.constraint_str)
+        self._cached_counts: Optional[Tuple[int, int, int, int]] = None
+        self._counts_version: int = -1
+        self.non_terminals: Optional[frozenset[NonTerminal]] = required_non_terminals(
+            constraint
+        )
 
     def evaluate(self, inputs):
         """
@@ -69,37 +347,123 @@ class FandangoConstraintCandidate(ConstraintCandidate):
         :param inputs:
         :return:
         """
-        for inp in inputs:
-            if inp in self.cache.keys():
-                continue
-            eval_result = self.constraint.check(inp.tree)
-            self._update_eval_results_and_combination(eval_result, inp)
+        inputs = list(dict.fromkeys(inputs))
+        ids = self.registry.ids_of(inputs)
+        is_new = ~check_bits(self.evaluated, ids)
+        if not is_new.any():
+            return
+
+        new_ids = ids[is_new]
+        check = self.registry.evaluation_cache.check
+        constraint, constraint_str = self.constraint, self.constraint_str
+        non_terminals = self.non_terminals
+        results = np.fromiter(
+            (
+                (
+                    non_terminals is not None
+                    and not non_terminals <= inp.get_non_terminal_symbols()
+                )
+                or check(constraint_str, constraint, inp, idx)
+                for inp, idx, new in zip(inputs, ids.tolist(), is_new.tolist())
+                if new
+            ),
+            dtype=bool,
+            count=len(new_ids),
+        )
+        self.evaluated = set_bits(self.evaluated, new_ids)
+        self.satisfied = set_bits(self.satisfied, new_ids[results])
+        self._cached_counts = None
+
+    def _counts(self) -> Tuple[int, int, int, int]:
+        """
+        Return the number of failing and passing inputs the candidate was evaluated on, and the number of
+        failing (true positives) and passing (false positives) inputs that satisfy the constraint.
+        The counts are cached until the candidate is evaluated on new inputs, reset, or an input is relabeled.
+        """
+        if (
+            self._cached_counts is not None
+            and self._counts_version == self.registry.version
+        ):
+            return self._cached_counts
+        evaluated, satisfied, failing = align_masks(
+            self.evaluated, self.satisfied, self.registry.failing
+        )
+        num_failing = popcount(evaluated & failing)
+        num_passing = popcount(evaluated) - num_failing
+        tp = popcount(satisfied & failing)
+        fp = popcount(satisfied) - tp
+        self._cached_counts = (num_failing, num_passing, tp, fp)
+        self._counts_version = self.registry.version
+        return self._cached_counts
+
+    def _eval_results(self, failing: bool) -> np.ndarray:
+        evaluated, satisfied, failing_mask = align_masks(
+            self.evaluated, self.satisfied, self.registry.failing
+        )
+        partition = evaluated & (failing_mask if failing else ~failing_mask)
+        return check_bits(satisfied, mask_ids(partition))
+
+    @property
+    def failing_inputs_eval_results(self) -> np.ndarray:
+        """
+        Return the evaluation results on the failing inputs as a boolean array, ordered by input id.
+        """
+        return self._eval_results(failing=True)
+
+    @property
+    def passing_inputs_eval_results(self) -> np.ndarray:
+        """
+        Return the evaluation results on the passing inputs as a boolean array, ordered by input id.
+        """
+        return self._eval_results(failing=False)
+
+    @property
+    def cache(self) -> Dict[FandangoInput, bool]:
+        """
+        Return the evaluation result for every input the candidate has been evaluated on.
+        """
+        ids = mask_ids(self.evaluated)
+        results = check_bits(self.satisfied, ids)
+        return {
+            self.registry.inputs[idx]: bool(result)
+            for idx, result in zip(ids.tolist(), results)
+        }
+
+    def get(self, inp: FandangoInput) -> Optional[bool]:
+        """
+        Return the evaluation result of the input, or None if the candidate has not been evaluated on it.
+        """
+        idx = self.registry.get(inp)
+        if idx is None:
+            return None
+        ids = np.array([idx], dtype=np.int64)
+        if not check_bits(self.evaluated, ids)[0]:
+            return None
+        return bool(check_bits(self.satisfied, ids)[0])
 
     def specificity(self) -> float:
         """
         Return the specificity of the candidate.
         """
-        if len(self.passing_inputs_eval_results) == 0:
+        _, num_passing, _, fp = self._counts()
+        if num_passing == 0:
             return 0.0
-        return sum(not int(entry) for entry in self.passing_inputs_eval_results) / len(
-            self.passing_inputs_eval_results
-        )
+        return (num_passing - fp) / num_passing
 
     def recall(self) -> float:
         """
         Return the recall of the candidate.
         """
-        if len(self.failing_inputs_eval_results) == 0:
+        num_failing, _, tp, _ = self._counts()
+        if num_failing == 0:
             return 0.0
-        tp = self.failing_inputs_eval_results.count(True)
-        return tp / len(self.failing_inputs_eval_results)
+        return tp / num_failing
 
     def precision(self) -> float:
         """
         Return the precision of the candidate.
         """
-        tp = self.failing_inputs_eval_results.count(True)
-        fp = self.passing_inputs_eval_results.count(True)
+        _, _, tp, fp = self._counts()
         denominator = tp + fp
         return tp / denominator if denominator else 0.0
 
@@ -107,9 +471,11 @@ class FandangoConstraintCandidate(ConstraintCandidate):
         """
         Return whether two candidates are equal.
         """
-        return isinstance(other, FandangoConstraintCandidate) and str(
-            self.constraint
-        ) == str(other.constraint)
+        return (
+            isinstance(other, FandangoConstraintCandidate)
+            and self.__hash == other.__hash
+            and self.constraint_str == other.constraint_str
+        )
 
     def __hash__(self):
         return self.__hash
@@ -124,25 +490,15 @@ class FandangoConstraintCandidate(ConstraintCandidate):
         :return: The conjunction of the candidate with the other candidate.
         """
         assert isinstance(other, FandangoConstraintCandidate)
-        # print(
-        #     f"Cache keys Self: {self.cache.keys()}, Other {other.cache.keys()}")
-        # print(self.constraint)
-        # print(other.constraint)
-        assert self.cache.keys() == other.cache.keys(), "Cache keys must be the same"
-
-        new_cache = {}
-        new_failing, new_passing = [], []
-
-        for inp, value_self in self.cache.items():
-            value_other = other.cache[inp]
-            r = (
-                value_self and value_other
-            )  # or `value_self or value_other` for `__or__`
-            new_cache[inp] = r
-
-            (new_failing if inp.oracle == OracleResult.FAILING else new_passing).append(
-                r
-            )
+        assert (
+            self.registry is other.registry
+        ), "Candidates must be evaluated on the same input registry"
+        evaluated, other_evaluated, satisfied, other_satisfied = align_masks(
+            self.evaluated, other.evaluated, self.satisfied, other.satisfied
+        )
+        assert np.array_equal(
+            evaluated, other_evaluated
+        ), "Candidates must be evaluated on the same inputs"
 
         return FandangoConstraintCandidate(
             constraint=ConjunctionConstraint(
@@ -151,9 +507,9 @@ class FandangoConstraintCandidate(ConstraintCandidate):
                 global_variables=self.constraint.global_variables,
                 # lazy=self.constraint.lazy,
             ),
-            failing_inputs_eval_results=new_failing,
-            passing_inputs_eval_results=new_passing,
-            cache=new_cache,
+            evaluated=evaluated.copy(),
+            satisfied=satisfied & other_satisfied,
+            registry=self.registry,
         )
 
     def __or__(
@@ -166,17 +522,15 @@ class FandangoConstraintCandidate(ConstraintCandidate):
         :return: The disjunction of the candidate with the other candidate.
         """
         assert isinstance(other, FandangoConstraintCandidate)
-
-        new_failing_inputs_eval_results = []
-        new_passing_inputs_eval_results = []
-        new_cache = {}
-        for inp in self.cache:
-            r = self.cache[inp] or other.cache[inp]
-            if inp.oracle == OracleResult.FAILING:
-                new_failing_inputs_eval_results.append(r)
-            else:
-                new_passing_inputs_eval_results.append(r)
-            new_cache[inp] = r
+        assert (
+            self.registry is other.registry
+        ), "Candidates must be evaluated on the same input registry"
+        evaluated, other_evaluated, satisfied, other_satisfied = align_masks(
+            self.evaluated, other.evaluated, self.satisfied, other.satisfied
+        )
+        assert np.array_equal(
+            evaluated, other_evaluated
+        ), "Candidates must be evaluated on the same inputs"
 
         return FandangoConstraintCandidate(
             constraint=DisjunctionConstraint(
@@ -184,75 +538,55 @@ class FandangoConstraintCandidate(ConstraintCandidate):
                 local_variables=self.constraint.local_variables,
                 global_variables=self.constraint.global_variables,
             ),
-            failing_inputs_eval_results=new_failing_inputs_eval_results,
-            passing_inputs_eval_results=new_passing_inputs_eval_results,
-            cache=new_cache,
+            evaluated=evaluated.copy(),
+            satisfied=satisfied | other_satisfied,
+            registry=self.registry,
         )
 
     def __neg__(self):
         """
         Return the negation of the candidate.
+        Negating a negation returns a candidate of the inner constraint instead of nesting negations.
 
         :return: The negation of the candidate.
         """
-        cache = {}
-        for inp in self.cache.keys():
-            cache[inp] = not self.cache[inp]
-
-        failing_inputs_eval_results = [
-            not eval_result for eval_result in self.failing_inputs_eval_results
-        ]
-        passing_inputs_eval_results = [
-            not eval_result for eval_result in self.passing_inputs_eval_results
-        ]
-
+        evaluated, satisfied = align_masks(self.evaluated, self.satisfied)
+        if isinstance(self.constraint, NegationConstraint):
+            constraint = self.constraint.inner_constraint
+        else:
+            constraint = NegationConstraint(self.constraint)
         return FandangoConstraintCandidate(
-            constraint=NegationConstraint(self.constraint),
-            failing_inputs_eval_results=failing_inputs_eval_results,
-            passing_inputs_eval_results=passing_inputs_eval_results,
-            cache=cache,
+            constraint=constraint,
+            evaluated=evaluated.copy(),
+            satisfied=evaluated & ~satisfied,
+            registry=self.registry,
         )
 
-    def _update_eval_results_and_combination(
-        self, eval_result: bool, inp: FandangoInput
-    ):
-        """
-        Update the evaluation results and combination with a new input and its evaluation result.
-        """
-        if inp.oracle == OracleResult.FAILING:
-            self.failing_inputs_eval_results.append(eval_result)
-        else:
-            self.passing_inputs_eval_results.append(eval_result)
-        self.cache[inp] = eval_result
-
     def reset(self):
-        self.failing_inputs_eval_results = []
-        self.passing_inputs_eval_results = []
-        self.cache = {}
+        self.evaluated = np.zeros(0, dtype=np.uint64)
+        self.satisfied = np.zeros(0, dtype=np.uint64)
+        self._cached_counts = None
 
     def __str__(self):
+        num_failing, num_passing, tp, fp = self._counts()
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / num_failing if num_failing else 0.0
         return (
-            f"{self.constraint}, "
-            f"Precision: {self.precision()}, "
-            f"Recall: {self.recall()} "
-            f"(based on {len(self.failing_inputs_eval_results)} failing "
-            f"and {len(self.passing_inputs_eval_results)} passing inputs)"
+            f"{self.constraint_str}, "
+            f"Precision: {precision}, "
+            f"Recall: {recall} "
+            f"(based on {num_failing} failing "
+            f"and {num_passing} passing inputs)"
         )
 
 
 class CandidateSet:
 
     def __init__(self, candidates: Optional[List[FandangoConstraintCandidate]] = None):
-        self.candidate_hashes = dict()
-        self.candidates = []
+        self.candidate_hashes: Dict[int, int] = dict()
+        self.candidates: List[FandangoConstraintCandidate] = []
 
-        candidates = candidates or []
-
-        for idx, candidate in enumerate(candidates):
-            candidate_hash = hash(candidate)
-            if candidate_hash not in self.candidate_hashes:
-                self.candidate_hashes[candidate_hash] = idx
-                self.candidates.append(candidate)
+        self.extend(candidates or [])
 
     def __repr__(self):
         """
@@ -278,6 +612,12 @@ class CandidateSet:
         """
         return iter(self.candidates)
 
+    def __contains__(self, candidate: FandangoConstraintCandidate) -> bool:
+        """
+        Return whether the candidate is part of the candidate set.
+        """
+        return hash(candidate) in self.candidate_hashes
+
     def append(self, candidate: FandangoConstraintCandidate):
         """
         Add a candidate to the candidate set.
@@ -287,14 +627,25 @@ class CandidateSet:
             self.candidate_hashes[candidate_hash] = len(self.candidates)
             self.candidates.append(candidate)
 
+    def extend(self, candidates: Iterable[FandangoConstraintCandidate]):
+        """
+        Add several candidates to the candidate set, hashing each candidate once.
+        """
+        candidate_hashes, appended = self.candidate_hashes, self.candidates
+        for candidate in candidates:
+            candidate_hash = hash(candidate)
+            if candidate_hash not in candidate_hashes:
+                candidate_hashes[candidate_hash] = len(appended)
+                appended.append(candidate)
+
     def remove(self, candidate: FandangoConstraintCandidate):
         """
         Remove a candidate from the candidate set.
         """
-        candidate_hash = hash(candidate)
-        if candidate_hash in self.candidate_hashes:
-            last_elem, idx = self.candidates[-1], self.candidate_hashes[candidate_hash]
+        idx = self.candidate_hashes.pop(hash(candidate), None)
+        if idx is None:
+            return
+        last_elem = self.candidates.pop()
+        if idx != len(self.candidates):
             self.candidates[idx] = last_elem
             self.candidate_hashes[hash(last_elem)] = idx
-            self.candidates.pop()
-            del self.candidate_hashes[candidate_hash]
@@ -1,12 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Union, List, Set
+from typing import Dict, Iterable, Tuple, Union, List, Set
 import itertools
+import functools
+import operator
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 from fandango.constraints.base import ConjunctionConstraint, DisjunctionConstraint
 
-from fdlearn.learning.candidate import FandangoConstraintCandidate, CandidateSet
+from fdlearn.learning.candidate import (
+    FandangoConstraintCandidate,
+    CandidateSet,
+    align_masks,
+    popcount,
+)
 from fdlearn.logger import LOGGER
-from fdlearn.data.oracle import OracleResult
+
+
+def stack_masks(
+    candidates: tuple[FandangoConstraintCandidate, ...],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the aligned evaluated and satisfied bitsets of the candidates, stacked as matrices.
+    """
+    masks = np.stack(
+        align_masks(
+            *(c.evaluated for c in candidates), *(c.satisfied for c in candidates)
+        )
+    )
+    evaluated, satisfied = masks[: len(candidates)], masks[len(candidates) :]
+    assert (
+        evaluated == evaluated[0]
+    ).all(), "All candidates must be evaluated on the same inputs"
+    return evaluated, satisfied
 
 
 def build_conjunction(
@@ -15,26 +41,33 @@ def build_conjunction(
     assert len(candidates) >= 2, "Need at least two candidates for conjunction"
 
     first = candidates[0]
-    cache_keys = first.cache.keys()
+    evaluated, satisfied = stack_masks(candidates)
+    new_satisfied = np.bitwise_and.reduce(satisfied, axis=0)
+
+    new_constraint = ConjunctionConstraint(
+        [c.constraint for c in candidates],
+        local_variables=first.constraint.local_variables,
+        global_variables=first.constraint.global_variables,
+    )
 
-    for other in candidates[1:]:
-        assert (
-            other.cache.keys() == cache_keys
-        ), "All candidates must share the same cache keys"
+    return FandangoConstraintCandidate(
+        constraint=new_constraint,
+        evaluated=evaluated[0].copy(),
+        satisfied=new_satisfied,
+        registry=first.registry,
+    )
 
-    new_cache = {}
-    new_failing, new_passing = [], []
 
-    for inp in cache_keys:
-        conjunction_value = all(c.cache[inp] for c in candidates)
-        new_cache[inp] = conjunction_value
+def build_disjunction(
+    candidates: tuple[FandangoConstraintCandidate, ...],
+) -> FandangoConstraintCandidate:
+    assert len(candidates) >= 2, "Need at least two candidates for disjunction"
 
-        if inp.oracle == OracleResult.FAILING:
-            new_failing.append(conjunction_value)
-        else:
-            new_passing.append(conjunction_value)
+    first = candidates[0]
+    evaluated, satisfied = stack_masks(candidates)
+    new_satisfied = np.bitwise_or.reduce(satisfied, axis=0)
 
-    new_constraint = ConjunctionConstraint(
+    new_constraint = DisjunctionConstraint(
         [c.constraint for c in candidates],
         local_variables=first.constraint.local_variables,
         global_variables=first.constraint.global_variables,
@@ -42,12 +75,81 @@ def build_conjunction(
 
     return FandangoConstraintCandidate(
         constraint=new_constraint,
-        failing_inputs_eval_results=new_failing,
-        passing_inputs_eval_results=new_passing,
-        cache=new_cache,
+        evaluated=evaluated[0].copy(),
+        satisfied=new_satisfied,
+        registry=first.registry,
     )
 
 
+def deduplicate_candidates(
+    candidates: Iterable[FandangoConstraintCandidate],
+) -> List[FandangoConstraintCandidate]:
+    """
+    Keep a single candidate for every distinct evaluation result.
+    Candidates that are evaluated on the same inputs and satisfied by the same inputs lead to the same
+    combinations, so only the candidate with the shortest constraint is kept. Ties are broken by the constraint
+    string, so the kept candidate does not depend on the iteration order of the candidates.
+    """
+    representatives: Dict[Tuple[bytes, bytes], FandangoConstraintCandidate] = {}
+    for candidate in candidates:
+        key = (
+            np.trim_zeros(candidate.evaluated, "b").tobytes(),
+            np.trim_zeros(candidate.satisfied, "b").tobytes(),
+        )
+        current = representatives.get(key)
+        if current is None or (
+            len(candidate.constraint_str),
+            candidate.constraint_str,
+        ) < (len(current.constraint_str), current.constraint_str):
+            representatives[key] = candidate
+    return list(representatives.values())
+
+
+def conjunction_precisions(
+    satisfied: np.ndarray,
+    failing: np.ndarray,
+    combinations: List[Tuple[int, ...]],
+) -> List[float]:
+    """
+    Return the precision of the conjunction of every combination.
+    The combinations index the rows of the stacked satisfied bitsets of the candidates.
+    Adding a candidate to a conjunction can never add true positives, so the conjunction of every
+    combination is computed from the one of its prefix, and extensions of a prefix without true
+    positives are not computed at all (their precision is 0.0).
+    """
+    max_size = max(map(len, combinations), default=0)
+    prefixes: Dict[Tuple[int, ...], np.ndarray] = {}
+    pruned: Set[Tuple[int, ...]] = set()
+
+    precisions = []
+    for combination in combinations:
+        head = combination[:-1]
+        extendable = len(combination) < max_size
+        if head in pruned:
+            if extendable:
+                pruned.add(combination)
+            precisions.append(0.0)
+            continue
+
+        if len(head) == 1:
+            head_mask = satisfied[head[0]]
+        else:
+            head_mask = prefixes.get(head)
+            if head_mask is None:
+                head_mask = np.bitwise_and.reduce(satisfied[list(head)], axis=0)
+        mask = head_mask & satisfied[combination[-1]]
+
+        tp = popcount(mask & failing)
+        if extendable:
+            if tp:
+                prefixes[combination] = mask
+            else:
+                pruned.add(combination)
+        total = popcount(mask)
+        precisions.append(tp / total if total else 0.0)
+    return precisions
+
+
 class CombinationProcessor(ABC):
 
     def __init__(self, min_precision: float, min_recall: float):
@@ -73,10 +175,15 @@ class ConjunctionProcessor(CombinationProcessor):
     """
 
     def __init__(
-        self, max_conjunction_size: int, min_precision: float, min_recall: float
+        self,
+        max_conjunction_size: int,
+        min_precision: float,
+        min_recall: float,
+        workers: int = 1,
     ):
         super().__init__(min_precision, min_recall)
         self.max_conjunction_size = max_conjunction_size
+        self.workers = workers
 
     def process(self, candidates: CandidateSet) -> Set[FandangoConstraintCandidate]:
         """
@@ -84,10 +191,14 @@ class ConjunctionProcessor(CombinationProcessor):
         :param candidates:
         :return:
         """
-        combinations = self.get_possible_conjunctions(candidates)
+        unique_candidates = deduplicate_candidates(candidates)
+        combinations = self.get_possible_conjunctions(CandidateSet(unique_candidates))
+        precisions = self.get_conjunction_precisions(unique_candidates, combinations)
 
         conjunction_candidates = set()
-        for combination in combinations:
+        for combination, precision in zip(combinations, precisions):
+            if not self.is_precision_valid(precision, combination):
+                continue
             # check min recall
             # if not self.check_minimum_recall(combination):
             #     print("Lol")
@@ -101,9 +212,7 @@ class ConjunctionProcessor(CombinationProcessor):
             #     # if not self.is_new_conjunction_valid(conjunction, con_list):
             #     #     valid = False
             #     # con_list.append(conjunction)
-            conjunction: FandangoConstraintCandidate = build_conjunction(combination)
-            if self.is_new_conjunction_valid(conjunction, combination):
-                conjunction_candidates.add(conjunction)
+            conjunction_candidates.add(build_conjunction(combination))
 
         LOGGER.info("Found %s valid conjunctions", len(conjunction_candidates))
         return conjunction_candidates
@@ -120,11 +229,58 @@ class ConjunctionProcessor(CombinationProcessor):
         the combination. The specificity of the new conjunction should be greater than the minimum specificity and
         the specificity of the conjunction should be greater than the specificity of the individual formula.
         """
-        new_precision = conjunction.precision()
-        return new_precision > self.min_precision and all(
-            new_precision > candidate.precision() for candidate in combination
+        return self.is_precision_valid(conjunction.precision(), combination)
+
+    def is_precision_valid(
+        self,
+        precision: float,
+        combination: Union[
+            List[FandangoConstraintCandidate], Tuple[FandangoConstraintCandidate, ...]
+        ],
+    ) -> bool:
+        """
+        Check if a conjunction of the combination with the given precision is valid, without building it.
+        """
+        return precision > self.min_precision and all(
+            precision > candidate.precision() for candidate in combination
         )
 
+    def get_conjunction_precisions(
+        self,
+        candidates: List[FandangoConstraintCandidate],
+        combinations: List[Tuple[FandangoConstraintCandidate, ...]],
+    ) -> List[float]:
+        """
+        Compute the precision of the conjunction of every combination on the bitsets of the candidates,
+        without building the conjunction constraints. With more than one worker, the combinations are
+        distributed over a process pool.
+        """
+        if not combinations:
+            return []
+        index = {candidate: idx for idx, candidate in enumerate(candidates)}
+        *rows, failing = align_masks(
+            *(candidate.satisfied for candidate in candidates),
+            candidates[0].registry.failing,
+        )
+        satisfied = np.stack(rows)
+        index_combinations = [
+            tuple(index[candidate] for candidate in combination)
+            for combination in combinations
+        ]
+        if self.workers <= 1 or len(index_combinations) < 2:
+            return conjunction_precisions(satisfied, failing, index_combinations)
+
+        chunksize = max(1, len(index_combinations) // (4 * self.workers))
+        chunks = [
+            index_combinations[start : start + chunksize]
+            for start in range(0, len(index_combinations), chunksize)
+        ]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                functools.partial(conjunction_precisions, satisfied, failing), chunks
+            )
+            return [precision for chunk in results for precision in chunk]
+
     def get_possible_conjunctions(
         self, candidate_set: CandidateSet
     ) -> List[Tuple[FandangoConstraintCandidate, ...]]:
@@ -132,7 +288,9 @@ class ConjunctionProcessor(CombinationProcessor):
         Get all possible conjunctions of the candidate set with a maximum size of max_conjunction_size.
         """
         combinations = []
-        sorted_candidates = sorted(candidate_set.candidates, key=lambda x: str(x))
+        sorted_candidates = sorted(
+            candidate_set.candidates, key=operator.attrgetter("constraint_str")
+        )
         candidate_set_without_conjunctions = [
             candidate
             for candidate in sorted_candidates
@@ -176,17 +334,7 @@ class DisjunctionProcessor(CombinationProcessor):
 
         disjunction_candidates = set()
         for combination in combinations:
-
-            disjunction: FandangoConstraintCandidate = combination[0]
-            # dis_list = [
-            #     disjunction,
-            # ]
-            # valid = True
-            for candidate in combination[1:]:
-                disjunction = disjunction | candidate
-                # if not self.is_new_disjunction_valid(disjunction, dis_list):
-                #     valid = False
-                # dis_list.append(disjunction)
+            disjunction: FandangoConstraintCandidate = build_disjunction(combination)
 
             if self.is_new_disjunction_valid(disjunction, combination):
                 print("Before:", [str(c) for c in combination])
@@ -222,7 +370,9 @@ class DisjunctionProcessor(CombinationProcessor):
         Get all possible disjunctions of the candidate set with a maximum size of max_disjunction_size.
         """
         combinations = []
-        sorted_candidates = sorted(candidate_set.candidates, key=lambda x: str(x))
+        sorted_candidates = sorted(
+            candidate_set.candidates, key=operator.attrgetter("constraint_str")
+        )
 
         candidate_set_without_disjunctions = [
             candidate
@@ -1,21 +1,106 @@
-from copy import deepcopy
-from typing import List, Dict, Set, Iterable, Tuple, Callable, Mapping
+from typing import (
+    List,
+    Dict,
+    Set,
+    Iterable,
+    Iterator,
+    Tuple,
+    Callable,
+    Mapping,
+    Optional,
+    Union,
+)
+import functools
 import re
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 from fandango.constraints.base import *
 from fandango.language.search import RuleSearch, AttributeSearch
 from fandango.language.symbol import NonTerminal
 
 from fdlearn.data import FandangoInput
-from fdlearn.learning.candidate import FandangoConstraintCandidate
+from fdlearn.learning.candidate import FandangoConstraintCandidate, InputRegistry
 from fdlearn.logger import LOGGER
 
 
-def all_combinations(sequences: list[list]) -> list[list]:
-    result = []
+def all_combinations(sequences: list[list]) -> Iterator[list]:
+    """
+    Lazily yields every combination, so the Cartesian product is never materialized.
+    """
     for combo in itertools.product(*sequences):
-        result.append(list(combo))
-    return result
+        yield list(combo)
+
+
+NON_TERMINAL_PLACEHOLDER = NonTerminal("<NON_TERMINAL>")
+ATTRIBUTE_PLACEHOLDER = NonTerminal("<ATTRIBUTE>")
+INTEGER_PLACEHOLDER = NonTerminal("<INTEGER>")
+STRING_PLACEHOLDER = NonTerminal("<STRING>")
+
+NUMBER_PATTERN = re.compile(r"-?(?:\d+|\d*\.\d+)(?:[eE]-?\d+)?", re.ASCII)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def parse_number(value: str) -> Optional[Union[int, float]]:
+    """
+    Return the number the string represents (an int for integers, a float otherwise), or None if it is no number.
+    As with Python literals, only ASCII digits count, integers with leading zeros (e.g. '007') are no numbers and
+    are kept as strings, and so are integers too long to be converted.
+    """
+    # Plain integers are by far the most common numbers and need no regex
+    digits = value[1:] if value.startswith("-") else value
+    if digits.isascii() and digits.isdecimal():
+        if digits[0] == "0" and digits.strip("0"):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            # Exceeds the limit of the int string conversion
+            return None
+    if NUMBER_PATTERN.fullmatch(value):
+        return float(value)
+    return None
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def placeholder_pattern(matches: Tuple[str, ...]) -> re.Pattern:
+    """
+    Return a regex matching any of the placeholder names, longest names first.
+    """
+    return re.compile("|".join(map(re.escape, sorted(matches, key=len, reverse=True))))
+
+
+def placeholder_substitution(matches: List[str]) -> Callable[[str, str], str]:
+    """
+    Return a function that replaces all placeholder names in a template with a value in one pass.
+    A single name, the common case, needs no regex.
+    """
+    if len(matches) == 1:
+        (match,) = matches
+        return lambda template, value: template.replace(match, value)
+    pattern = placeholder_pattern(tuple(matches))
+    return lambda template, value: pattern.sub(lambda _: value, template)
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def compile_expression(source: str):
+    """
+    Compile the expression source once; patterns share their source across non-terminals.
+    Sources that do not compile are cached as None, so they are only reported once.
+    """
+    try:
+        return compile(source, "<partial>", "eval")
+    except SyntaxError as e:
+        e.add_note("Evaluation failed: " + source)
+        LOGGER.debug(e)
+        return None
+
+
+def quote_value(value: str) -> str:
+    """
+    Return the value as a quoted string literal for the constraint source.
+    """
+    return f"'{value}'"
 
 
 class ValueMaps:
@@ -23,6 +108,7 @@ class ValueMaps:
         self.relevant_non_terminals = relevant_non_terminals
         self._string_values = {nt: set() for nt in self.relevant_non_terminals}
         self._int_values = {nt: set() for nt in self.relevant_non_terminals}
+        self._filtered_int_values: Optional[Dict[NonTerminal, Set[int]]] = None
 
     def get_string_values_for_non_terminal(self, non_terminal: NonTerminal) -> Set[str]:
         return self._string_values[non_terminal]
@@ -31,7 +117,49 @@ class ValueMaps:
         return self._int_values[non_terminal]
 
     def get_filtered_int_values(self) -> Dict[NonTerminal, Set[str]]:
-        return self._calculate_filtered_int_values()
+        """Returns the min and max integer values per non-terminal, computed once per extraction."""
+        if self._filtered_int_values is None:
+            self._filtered_int_values = self._calculate_filtered_int_values()
+        return self._filtered_int_values
+
+    def alias_int_values(self, bound: NonTerminal, non_terminal: NonTerminal):
+        """Makes the integer values of the non-terminal available for the bound variable."""
+        if non_terminal in self._int_values:
+            self._int_values[bound] = self._int_values[non_terminal]
+            if self._filtered_int_values is not None:
+                if non_terminal in self._filtered_int_values:
+                    self._filtered_int_values[bound] = self._filtered_int_values[
+                        non_terminal
+                    ]
+                else:
+                    self._filtered_int_values.pop(bound, None)
+
+    def save_binding(
+        self, bound: NonTerminal
+    ) -> Tuple[Optional[Set[str]], Optional[Set[int]]]:
+        """Returns the current values of the bound variable, to be restored with restore_binding."""
+        return self._string_values.get(bound), self._int_values.get(bound)
+
+    def restore_binding(
+        self,
+        bound: NonTerminal,
+        saved: Tuple[Optional[Set[str]], Optional[Set[int]]],
+    ):
+        """Restores the values of the bound variable, so nested bindings do not leak."""
+        string_values, int_values = saved
+        for values, saved_values in (
+            (self._string_values, string_values),
+            (self._int_values, int_values),
+        ):
+            if saved_values is None:
+                values.pop(bound, None)
+            else:
+                values[bound] = saved_values
+        if self._filtered_int_values is not None:
+            if int_values:
+                self._filtered_int_values[bound] = {min(int_values), max(int_values)}
+            else:
+                self._filtered_int_values.pop(bound, None)
 
     def get_string_values(self) -> Dict[NonTerminal, Set[str]]:
         return self._string_values
@@ -39,66 +167,137 @@ class ValueMaps:
     def get_int_values(self) -> Dict[NonTerminal, Set[int]]:
         return self._int_values
 
-    @staticmethod
-    def is_number(value: str) -> bool:
-        """Check if the given string represents a number."""
-        try:
-            float(eval(value))
-            return True
-        except Exception:
-            return False
-
     @staticmethod
     def is_number_re(s):
-        if not s.strip():
-            return False
-        number_pattern = re.compile(r"^-?(?:\d+|\d*\.\d+)(?:[eE]-?\d+)?$")
-        return bool(number_pattern.match(s))
+        return bool(NUMBER_PATTERN.fullmatch(s))
 
     @staticmethod
     def longest_common_substring(strings):
         if not strings:
             return ""
 
-        # Choose the shortest string, as any common substring must be a substring of it
+        # Build a suffix automaton of the shortest string, as any common substring must
+        # be a substring of it
+        strings = list(dict.fromkeys(strings))
         shortest = min(strings, key=len)
-        n = len(shortest)
+        length, link, transitions, first_end = [0], [-1], [{}], [-1]
+        last = 0
+        for position, char in enumerate(shortest):
+            current = len(length)
+            length.append(length[last] + 1)
+            link.append(0)
+            transitions.append({})
+            first_end.append(position)
+            state = last
+            while state != -1 and char not in transitions[state]:
+                transitions[state][char] = current
+                state = link[state]
+            if state != -1:
+                target = transitions[state][char]
+                if length[state] + 1 == length[target]:
+                    link[current] = target
+                else:
+                    clone = len(length)
+                    length.append(length[state] + 1)
+                    link.append(link[target])
+                    transitions.append(dict(transitions[target]))
+                    first_end.append(first_end[target])
+                    while state != -1 and transitions[state].get(char) == target:
+                        transitions[state][char] = clone
+                        state = link[state]
+                    link[target] = link[current] = clone
+            last = current
+
+        # Longest suffix of each state that is contained in all other strings. Shorter
+        # strings are matched first, as they shrink the common lengths the most.
+        common = list(length)
+        by_length = sorted(range(1, len(length)), key=length.__getitem__, reverse=True)
+        for other in sorted(strings, key=len):
+            if other is shortest:
+                continue
+            matched = [0] * len(length)
+            state = matched_length = 0
+            for char in other:
+                target = transitions[state].get(char)
+                while target is None and state:
+                    state = link[state]
+                    matched_length = length[state]
+                    target = transitions[state].get(char)
+                if target is None:
+                    matched_length = 0
+                else:
+                    state = target
+                    matched_length += 1
+                if matched_length > matched[state]:
+                    matched[state] = matched_length
+            # A match in a state is also a match of all its suffix links
+            for state in by_length:
+                parent = link[state]
+                matched[parent] = max(
+                    matched[parent], min(matched[state], length[parent])
+                )
+            common = [min(pair) for pair in zip(common, matched)]
+            if not any(common):
+                return ""
 
-        # Check all possible substring lengths, from longest to shortest
-        for sub_len in range(n, 0, -1):
-            # Try every substring of length sub_len in the shortest string
-            for start in range(n - sub_len + 1):
-                candidate = shortest[start : start + sub_len]
-                # Check if this candidate is in all strings
-                if all(candidate in s for s in strings):
-                    return candidate  # Return as soon as we find the longest common substring
+        best = max(common)
+        if best == 0:
+            return ""
 
-        # If no common substring is found (shouldn't happen unless the list is empty), return an empty string
-        return ""
+        # Return the leftmost common substring of the longest length in the shortest string
+        start = min(
+            first_end[state] - best + 1
+            for state in range(len(common))
+            if common[state] == best
+        )
+        return shortest[start : start + best]
 
     def extract_non_terminal_values(
         self, inputs: Set[FandangoInput]
     ) -> Tuple[Dict[NonTerminal, Set[str]], Dict[NonTerminal, Set[float]]]:
         """Extracts and returns values associated with non-terminals."""
 
-        for non_terminal in self.relevant_non_terminals:
-            strings = []
-            for input_obj in inputs:
-                found_trees = input_obj.tree.find_all_trees(non_terminal)
-                for tree in found_trees:
-                    value = str(tree)
-                    strings.append(value)
-                    if self.is_number(value):
-                        self._int_values[non_terminal].add(eval(value))
-                    else:
-                        self._string_values[non_terminal].add(value)
-
-            longest_common_substring = self.longest_common_substring(strings)
+        # Walk every tree once and collect the values of all relevant non-terminals
+        strings: Dict[NonTerminal, List[str]] = {
+            non_terminal: [] for non_terminal in self.relevant_non_terminals
+        }
+        for input_obj in inputs:
+            for non_terminal, value in self.collect_values(input_obj.tree):
+                strings[non_terminal].append(value)
+
+        for non_terminal, values in strings.items():
+            for value in values:
+                number = parse_number(value)
+                if number is not None:
+                    self._int_values[non_terminal].add(number)
+                else:
+                    self._string_values[non_terminal].add(value)
+
+            longest_common_substring = self.longest_common_substring(values)
             if len(longest_common_substring) >= 2:
                 self._string_values[non_terminal].add(longest_common_substring)
 
+        self._filtered_int_values = None
         return self._string_values, self._int_values
 
+    def collect_values(self, tree: DerivationTree) -> List[Tuple[NonTerminal, str]]:
+        """
+        Returns the values of all subtrees of relevant non-terminals, in a single walk of the tree.
+        Like find_all_trees, the subtrees are visited in post-order.
+        """
+        values = []
+        relevant_non_terminals = self.relevant_non_terminals
+        stack = [(tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if visited:
+                values.append((node.symbol, str(node)))
+                continue
+            if node.symbol in relevant_non_terminals:
+                stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+        return values
+
     def _calculate_filtered_int_values(self) -> Dict[NonTerminal, Set[str]]:
         """Filters the value map to only include min and max values for non-terminals that have integer values."""
         reduced_int_values = {}
@@ -109,13 +308,60 @@ class ValueMaps:
         return reduced_int_values
 
 
+def expand_patterns(
+    patterns: Iterable[Constraint],
+    relevant_non_terminals: Set[NonTerminal],
+    positive_inputs: Set[FandangoInput],
+    value_maps: ValueMaps,
+    reachability_map: Dict[NonTerminal, Set[NonTerminal]] = None,
+) -> Iterator[Constraint]:
+    """
+    Lazily instantiates the patterns, independently of each other.
+    """
+    # Every pattern flows through the non-terminal, string, and integer expansion
+    # before the next one is expanded, so only its intermediate constraints are kept
+    nt_transformer = NonTerminalPlaceholderTransformer(
+        relevant_non_terminals, reachability_map
+    )
+    # Both value passes search the same input trees, so they share the search results
+    find_cache = {}
+    string_transformer = StringValuePlaceholderTransformer(
+        value_maps, positive_inputs, find_cache
+    )
+    int_transformer = IntegerValuePlaceholderTransformer(
+        value_maps, positive_inputs, find_cache
+    )
+
+    # Equal constraints are only expanded once by the integer pass, which evaluates
+    # partial values; they are compared by their string, like the candidates
+    seen = set()
+    for pattern in patterns:
+        for nt_pattern in nt_transformer.transform(pattern):
+            for string_pattern in string_transformer.transform(nt_pattern):
+                key = str(string_pattern)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield from int_transformer.transform(string_pattern)
+
+
+def instantiate_pattern_chunk(
+    patterns: Iterable[Constraint], **kwargs
+) -> List[Constraint]:
+    """
+    Instantiates a chunk of patterns, so chunks can be expanded in worker processes.
+    """
+    return list(expand_patterns(patterns, **kwargs))
+
+
 class PatternProcessor:
     """
     Manages the instantiation of patterns by applying the appropriate PatternInstantiation class.
     """
 
-    def __init__(self, patterns: Iterable[Constraint]):
+    def __init__(self, patterns: Iterable[Constraint], workers: int = 1):
         self.patterns = patterns
+        self.workers = workers
 
     def instantiate_patterns(
         self,
@@ -123,37 +369,37 @@ class PatternProcessor:
         positive_inputs: Set[FandangoInput],
         value_maps: ValueMaps,
         reachability_map: Dict[NonTerminal, Set[NonTerminal]] = None,
+        registry: Optional[InputRegistry] = None,
     ) -> Set[FandangoConstraintCandidate]:
-
-        # Replace non-terminal placeholders with actual non-terminals
-        instantiated_patterns = []
-        for pattern in self.patterns:
-            transformer = NonTerminalPlaceholderTransformer(relevant_non_terminals, reachability_map)
-            all_candidates: List[Constraint] = transformer.transform(pattern)
-            instantiated_patterns.extend(all_candidates)
-
-        string_patterns = []
-        # Replace value placeholders with actual values
-        for pattern in instantiated_patterns:
-            transformer = StringValuePlaceholderTransformer(value_maps, positive_inputs)
-            pattern.accept(transformer)
-            transformed = transformer.results
-            string_patterns.extend(transformed)
-
-        int_patterns = []
-        for pattern in string_patterns:
-            transformer = IntegerValuePlaceholderTransformer(
-                value_maps, positive_inputs
-            )
-            pattern.accept(transformer)
-            transformed = transformer.results
-            int_patterns.extend(transformed)
-
-        new_candidates = set()
-        for pattern in int_patterns:
-            new_candidates.add(FandangoConstraintCandidate(pattern))
-
-        return new_candidates
+        patterns = list(self.patterns)
+        options = dict(
+            relevant_non_terminals=relevant_non_terminals,
+            positive_inputs=positive_inputs,
+            value_maps=value_maps,
+            reachability_map=reachability_map,
+        )
+        if self.workers <= 1 or len(patterns) < 2:
+            # Stream the instantiations into the candidate set without a list in between
+            constraints = expand_patterns(patterns, **options)
+        else:
+            instantiate = functools.partial(instantiate_pattern_chunk, **options)
+            chunksize = max(1, len(patterns) // (4 * self.workers))
+            chunks = [
+                patterns[start : start + chunksize]
+                for start in range(0, len(patterns), chunksize)
+            ]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                constraints = [
+                    constraint
+                    for chunk in executor.map(instantiate, chunks)
+                    for constraint in chunk
+                ]
+
+        # Candidates are created in this process, as they register their inputs in the registry
+        return {
+            FandangoConstraintCandidate(constraint, registry=registry)
+            for constraint in constraints
+        }
 
 
 class NonTerminalPlaceholderTransformer:
@@ -178,6 +424,21 @@ class NonTerminalPlaceholderTransformer:
         self.reachability_map: Dict[NonTerminal, Set[NonTerminal]] = (
             dict(reachability_map) if reachability_map else {}
         )
+        self._placeholder_key_cache: Dict[
+            int, Tuple[Dict[str, "RuleSearch | AttributeSearch"], List[str], List[str]]
+        ] = {}
+        self._dispatch: Dict[
+            type,
+            Callable[[Constraint, Dict[NonTerminal, NonTerminal]], List[Constraint]],
+        ] = {
+            ComparisonConstraint: self._visit_comparison,
+            ExpressionConstraint: self._visit_expression,
+            ForallConstraint: self._visit_forall,
+            ExistsConstraint: self._visit_exists,
+            ConjunctionConstraint: self._visit_conjunction,
+            ImplicationConstraint: self._visit_implication,
+            DisjunctionConstraint: self._visit_disjunction,
+        }
 
     def transform(self, root: "Constraint") -> List["Constraint"]:
         """
@@ -193,31 +454,42 @@ class NonTerminalPlaceholderTransformer:
         """
         Dispatch based on constraint type, always returning a List[Constraint].
         """
-        if isinstance(constraint, ComparisonConstraint):
-            return self._visit_comparison(constraint, bounded_map)
-
-        if isinstance(constraint, ExpressionConstraint):
-            return self._visit_expression(constraint, bounded_map)
-
-        if isinstance(constraint, ForallConstraint):
-            return self._visit_forall(constraint, bounded_map)
-
-        if isinstance(constraint, ExistsConstraint):
-            return self._visit_exists(constraint, bounded_map)
-
-        if isinstance(constraint, ConjunctionConstraint):
-            return self._visit_conjunction(constraint, bounded_map)
-
-        if isinstance(constraint, ImplicationConstraint):
-            return self._visit_implication(constraint, bounded_map)
-
-        if isinstance(constraint, DisjunctionConstraint):
-            # If you truly cannot handle disjunctions, keep this.
-            raise NotImplementedError("Disjunctions are not yet supported.")
+        handler = self._dispatch.get(type(constraint))
+        if handler is None:
+            # Subclasses of the known constraint types are dispatched to their base type;
+            # the resolved handler is remembered, so each type is only resolved once
+            handler = next(
+                (
+                    visit
+                    for constraint_type, visit in self._dispatch.items()
+                    if isinstance(constraint, constraint_type)
+                ),
+                self._visit_other,
+            )
+            self._dispatch[type(constraint)] = handler
+        return handler(constraint, bounded_map)
 
-        # Fallback: return it as‐is if it’s some other Constraint subtype.
+    @staticmethod
+    def _visit_other(
+        constraint: "Constraint",
+        bounded_map: Dict[NonTerminal, NonTerminal],
+    ) -> List["Constraint"]:
+        """
+        Fallback: return it as‐is if it’s some other Constraint subtype.
+        """
         return [constraint]
 
+    def _visit_disjunction(
+        self,
+        constraint: "DisjunctionConstraint",
+        bounded_map: Dict[NonTerminal, NonTerminal],
+    ) -> List["Constraint"]:
+        """
+        Disjunctions are not yet supported.
+        """
+        # If you truly cannot handle disjunctions, keep this.
+        raise NotImplementedError("Disjunctions are not yet supported.")
+
     def _visit_comparison(
         self,
         constraint: "ComparisonConstraint",
@@ -227,7 +499,9 @@ class NonTerminalPlaceholderTransformer:
         1) Generate all fully‐expanded `searches` dicts via `_expand_searches`.
         2) Rebuild a ComparisonConstraint for each expanded‐searches.
         """
-        expanded_search_dicts = self._expand_searches(constraint.searches, bounded_map)
+        expanded_search_dicts = self._expand_searches(
+            constraint.searches, bounded_map, symmetric=self.is_symmetric(constraint)
+        )
 
         result: List["Constraint"] = []
         for searches_dict in expanded_search_dicts:
@@ -243,6 +517,32 @@ class NonTerminalPlaceholderTransformer:
             )
         return result
 
+    @staticmethod
+    def is_symmetric(constraint: "ComparisonConstraint") -> bool:
+        """
+        Returns whether the comparison does not change when its two <NON_TERMINAL> placeholders are swapped,
+        e.g., int(<NON_TERMINAL>) == int(<NON_TERMINAL>).
+        """
+        if constraint.operator not in (Comparison.EQUAL, Comparison.NOT_EQUAL):
+            return False
+        if len(constraint.searches) != 2:
+            return False
+        if not all(
+            isinstance(search, RuleSearch) and search.symbol == NON_TERMINAL_PLACEHOLDER
+            for search in constraint.searches.values()
+        ):
+            return False
+        # Both names are swapped at once; the comparison is unchanged if each side turns into the other
+        first, second = constraint.searches
+        swap = {first: second, second: first}
+        pattern = placeholder_pattern((first, second))
+
+        def swapped(text: str) -> str:
+            return pattern.sub(lambda match: swap[match.group()], text)
+
+        left, right = constraint.left, constraint.right
+        return swapped(left) == right and swapped(right) == left
+
     def _visit_expression(
         self,
         constraint: "ExpressionConstraint",
@@ -280,7 +580,9 @@ class NonTerminalPlaceholderTransformer:
             new_search = RuleSearch(nt)
             for inner in inner_results:
                 final.append(
-                    ForallConstraint(statement=inner, bound=constraint.bound, search=new_search)
+                    ForallConstraint(
+                        statement=inner, bound=constraint.bound, search=new_search
+                    )
                 )
         return final
 
@@ -299,7 +601,7 @@ class NonTerminalPlaceholderTransformer:
         # Figure out if this ExistsConstraint.search is exactly <NON_TERMINAL>
         is_nt_placeholder = (
             isinstance(constraint.search, RuleSearch)
-            and constraint.search.symbol == NonTerminal("<NON_TERMINAL>")
+            and constraint.search.symbol == NON_TERMINAL_PLACEHOLDER
         )
 
         for candidate_nt in self.relevant_non_terminals:
@@ -308,14 +610,22 @@ class NonTerminalPlaceholderTransformer:
             else:
                 new_search = constraint.search
 
-            # Thread a fresh bounded_map so attributes can see this binding
-            new_bounded = {**bounded_map, candidate_nt: constraint.bound}
-
-            # Recurse on the inner statement under new_bounded
-            inner_expanded = self._visit(constraint.statement, new_bounded)
+            # Bind in place so attributes can see this binding, and roll it back
+            # afterwards instead of copying the bounded_map for every candidate
+            previous = bounded_map.get(candidate_nt)
+            bounded_map[candidate_nt] = constraint.bound
+            try:
+                inner_expanded = self._visit(constraint.statement, bounded_map)
+            finally:
+                if previous is None:
+                    del bounded_map[candidate_nt]
+                else:
+                    bounded_map[candidate_nt] = previous
             for inner in inner_expanded:
                 result.append(
-                    ExistsConstraint(statement=inner, bound=constraint.bound, search=new_search)
+                    ExistsConstraint(
+                        statement=inner, bound=constraint.bound, search=new_search
+                    )
                 )
 
         return result
@@ -334,9 +644,11 @@ class NonTerminalPlaceholderTransformer:
         for sub in constraint.constraints:
             expanded_lists.append(self._visit(sub, bounded_map))
 
-        # all_combinations produces a List[List[Constraint]] of every possible tuple
-        all_tuples = all_combinations(expanded_lists)
-        return [ConjunctionConstraint(constraints=combo) for combo in all_tuples]
+        # all_combinations lazily yields every possible combination as a list
+        return [
+            ConjunctionConstraint(constraints=combo)
+            for combo in all_combinations(expanded_lists)
+        ]
 
     def _visit_implication(
         self,
@@ -355,14 +667,43 @@ class NonTerminalPlaceholderTransformer:
                 result.append(ImplicationConstraint(antecedent=a, consequent=c))
         return result
 
+    def _placeholder_keys(
+        self, base_searches: Dict[str, "RuleSearch | AttributeSearch"]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Returns the keys of the <NON_TERMINAL> and <ATTRIBUTE> placeholders. Statements inside
+        quantifiers are expanded once per bound non-terminal, so the keys are cached per searches dict.
+        Replacing <NON_TERMINAL> never introduces <ATTRIBUTE>, so both are grouped once.
+        """
+        cached = self._placeholder_key_cache.get(id(base_searches))
+        if cached is not None and cached[0] is base_searches:
+            return cached[1], cached[2]
+
+        nt_keys = []
+        attr_keys = []
+        for key, search in base_searches.items():
+            if isinstance(search, RuleSearch):
+                if search.symbol == NON_TERMINAL_PLACEHOLDER:
+                    nt_keys.append(key)
+                elif search.symbol == ATTRIBUTE_PLACEHOLDER:
+                    attr_keys.append(key)
+        # The searches dict is kept in the entry, so its id cannot be reused
+        self._placeholder_key_cache[id(base_searches)] = (
+            base_searches,
+            nt_keys,
+            attr_keys,
+        )
+        return nt_keys, attr_keys
+
     def _expand_searches(
         self,
         base_searches: Dict[str, "RuleSearch | AttributeSearch"],
         bounded_map: Dict[NonTerminal, NonTerminal],
-    ) -> List[Dict[str, "RuleSearch | AttributeSearch"]]:
+        symmetric: bool = False,
+    ) -> Iterator[Dict[str, "RuleSearch | AttributeSearch"]]:
         """
-        Core placeholder‐expansion helper. Given an initial `base_searches` dict, produce
-        a list of *fully‐instantiated* `searches` dicts by:
+        Core placeholder‐expansion helper. Given an initial `base_searches` dict, lazily
+        yield *fully‐instantiated* `searches` dicts by:
 
           1) Replacing all <NON_TERMINAL> placeholders with every combination of
              `self.relevant_non_terminals`.
@@ -370,66 +711,82 @@ class NonTerminalPlaceholderTransformer:
              loop over each (bound_nt → bound_symbol) in `bounded_map` and over
              `self.reachability_map[bound_nt]` to fill in <ATTRIBUTE>.
 
+        If `symmetric` is set, the <NON_TERMINAL> placeholders are interchangeable, and every multiset of
+        replacements is only produced once.
+
         If there are no placeholders of a given type, that stage just yields the input dict unchanged.
         If there are <ATTRIBUTE> placeholders but no valid `(bound_nt, reachable_set)` pairs,
-        this will yield an empty list (i.e. no valid expansions).
+        this will yield nothing (i.e. no valid expansions).
         """
-        # 1) Find keys whose searches[...] is exactly `<NON_TERMINAL>`
-        nt_keys = [
-            key
-            for key, search in base_searches.items()
-            if isinstance(search, RuleSearch) and search.symbol == NonTerminal("<NON_TERMINAL>")
-        ]
+        # 1) Find keys whose searches[...] is exactly `<NON_TERMINAL>` or `<ATTRIBUTE>`.
+        nt_keys, attr_keys = self._placeholder_keys(base_searches)
+
+        # Only bound non-terminals with reachable attributes can fill <ATTRIBUTE>;
+        # without such a pair, the pattern is pruned before any product is built.
+        # All placeholders of one combination are filled from the reachable set of a
+        # single bound non-terminal. Bound non-terminals that share a symbol yield the
+        # same combinations, so every combination is kept only once.
+        attribute_combos: List[Tuple[AttributeSearch, ...]] = []
+        if attr_keys:
+            # Replace placeholders with AttributeSearch(RuleSearch(bound_symbol), RuleSearch(attr_nt)),
+            # built once per pair and shared by all partials
+            attribute_searches: Dict[
+                Tuple[NonTerminal, NonTerminal], AttributeSearch
+            ] = {}
+            seen: Set[Tuple[NonTerminal, Tuple[NonTerminal, ...]]] = set()
+            for bound_nt, bound_symbol in bounded_map.items():
+                reachable = self.reachability_map.get(bound_nt, ())
+                for attr_nt in reachable:
+                    if (bound_symbol, attr_nt) not in attribute_searches:
+                        attribute_searches[(bound_symbol, attr_nt)] = AttributeSearch(
+                            RuleSearch(bound_symbol), RuleSearch(attr_nt)
+                        )
+                for attr_nts in itertools.product(reachable, repeat=len(attr_keys)):
+                    if (bound_symbol, attr_nts) in seen:
+                        continue
+                    seen.add((bound_symbol, attr_nts))
+                    attribute_combos.append(
+                        tuple(
+                            attribute_searches[(bound_symbol, attr_nt)]
+                            for attr_nt in attr_nts
+                        )
+                    )
+            if not attribute_combos:
+                return
 
-        # Build “partially expanded” list by substituting <NON_TERMINAL>
-        partials: List[Dict[str, "RuleSearch | AttributeSearch"]] = []
+        # Substitute <NON_TERMINAL>; without it, the input is the only partial
         if nt_keys:
+            # Searches are never mutated, so one RuleSearch per non-terminal is shared
+            # by all combinations instead of allocating one per key and combination.
+            # The non-terminals are sorted, so the symmetric expansion picks the same
+            # order of every multiset regardless of the set's iteration order.
+            rule_searches = tuple(
+                RuleSearch(nt) for nt in sorted(self.relevant_non_terminals, key=str)
+            )
             # For every tuple of replacements (one non‐terminal per nt_key)
-            for combo in itertools.product(self.relevant_non_terminals, repeat=len(nt_keys)):
-                new_searches = deepcopy(base_searches)
-                for key, nt_repl in zip(nt_keys, combo):
-                    new_searches[key] = RuleSearch(nt_repl)
-                partials.append(new_searches)
+            if symmetric:
+                combos = itertools.combinations_with_replacement(
+                    rule_searches, len(nt_keys)
+                )
+            else:
+                combos = itertools.product(rule_searches, repeat=len(nt_keys))
         else:
-            partials.append(deepcopy(base_searches))
-
-        # 2) For each partial, fill in <ATTRIBUTE> if any
-        final_expanded: List[Dict[str, "RuleSearch | AttributeSearch"]] = []
-        for part in partials:
-            # Find keys whose searches[...] is `<ATTRIBUTE>`
-            attr_keys = [
-                key
-                for key, search in part.items()
-                if isinstance(search, RuleSearch) and search.symbol == NonTerminal("<ATTRIBUTE>")
-            ]
+            combos = [()]
+
+        for combo in combos:
+            part = dict(base_searches)
+            part.update(zip(nt_keys, combo))
 
+            # 2) For each partial, fill in <ATTRIBUTE> if any
             if not attr_keys:
                 # No <ATTRIBUTE> placeholders → this partial is fully expanded
-                final_expanded.append(part)
+                yield part
                 continue
 
-            # There *are* <ATTRIBUTE> placeholders; we need at least one (bound_nt → reachable) pair
-            any_expanded = False
-            for bound_nt, bound_symbol in bounded_map.items():
-                reachable = self.reachability_map.get(bound_nt, ())
-                if not reachable:
-                    continue
-
-                for combo in itertools.product(reachable, repeat=len(attr_keys)):
-                    new_searches = deepcopy(part)
-                    for key, attr_nt in zip(attr_keys, combo):
-                        # Replace placeholder with AttributeSearch(RuleSearch(bound_symbol), RuleSearch(attr_nt))
-                        new_searches[key] = AttributeSearch(RuleSearch(bound_symbol), RuleSearch(attr_nt))
-                    final_expanded.append(new_searches)
-                    any_expanded = True
-
-            # If no bound_nt → reachable existed, this partial yields ZERO expansions
-            # (i.e. if you had <ATTRIBUTE> but no valid bound_nts, you get no results)
-            if not any_expanded:
-                # (Intentionally drop this partial entirely—no valid expansions.)
-                pass
-
-        return final_expanded
+            for attr_combo in attribute_combos:
+                new_searches = dict(part)
+                new_searches.update(zip(attr_keys, attr_combo))
+                yield new_searches
 
 
 class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
@@ -441,12 +798,14 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         self,
         value_maps: ValueMaps,
         test_inputs: Set[FandangoInput],
+        find_cache: Optional[Dict[Tuple[int, NonTerminal], List]] = None,
     ):
         """
         Initialize the transformer with value maps for placeholders.
 
         Args:
             value_maps (Dict[str, Dict[NonTerminal, List[str]]]): Mapping of placeholders to their replacement values.
+            find_cache (Dict[Tuple[int, NonTerminal], List]): Rule search results to share with other transformers.
         """
         super().__init__()
         self.value_maps: ValueMaps = value_maps
@@ -454,18 +813,55 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         self.test_inputs: Set[FandangoInput] = test_inputs
 
         self.bounded_non_terminals: dict[NonTerminal, NonTerminal] = dict()
+        # The test inputs are fixed, so rule searches over their trees are only done once
+        self._find_cache: Dict[Tuple[int, NonTerminal], List] = (
+            find_cache if find_cache is not None else {}
+        )
 
     def do_continue(self, constraint: "Constraint") -> bool:
         return False
 
+    def transform(self, constraint: Constraint) -> List[Constraint]:
+        """
+        Returns all instantiations of the constraint, so that one transformer can be reused for many constraints.
+        """
+        self.results = []
+        constraint.accept(self)
+        results, self.results = self.results, []
+        return results
+
+    @staticmethod
+    def has_placeholder(constraint: Constraint, placeholder: NonTerminal) -> bool:
+        return any(
+            isinstance(search, RuleSearch) and search.symbol == placeholder
+            for search in constraint.searches.values()
+        )
+
     @abstractmethod
     def update_value_map(self, bound: NonTerminal, search: RuleSearch):
         """ """
         raise NotImplementedError()
 
-    @abstractmethod
-    def remove_value_map(self, bound: NonTerminal):
-        raise NotImplementedError()
+    @contextmanager
+    def bind(self, bound: NonTerminal, search: RuleSearch, exists: bool = False):
+        """
+        Binds the values of the search to the bound variable for the duration of the scope.
+        An outer binding of the same variable is restored afterwards, even on errors.
+        """
+        saved = self.value_maps.save_binding(bound)
+        previous = self.bounded_non_terminals.get(bound)
+        self.update_value_map(bound, search)
+        if exists:
+            self.bounded_non_terminals[bound] = search.symbol
+        try:
+            yield
+        finally:
+            self.value_maps.restore_binding(bound, saved)
+            if exists:
+                if previous is None:
+                    del self.bounded_non_terminals[bound]
+                else:
+                    self.bounded_non_terminals[bound] = previous
 
     @abstractmethod
     def visit_comparison_constraint(self, constraint: "ComparisonConstraint"):
@@ -482,9 +878,8 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
             constraint.search, RuleSearch
         ), f"AttributeSearch not yet supported! {constraint}"
 
-        self.update_value_map(constraint.bound, constraint.search)
-        constraint.statement.accept(self)
-        self.remove_value_map(constraint.bound)
+        with self.bind(constraint.bound, constraint.search):
+            constraint.statement.accept(self)
         transformed_constraints = self.results
         self.results = []  # Reset for independent processing
 
@@ -505,12 +900,8 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
             constraint.search, RuleSearch
         ), f"AttributeSearch not yet supported! {constraint}"
 
-        self.update_value_map(constraint.bound, constraint.search)
-        self.bounded_non_terminals[constraint.bound] = constraint.search.symbol
-        constraint.statement.accept(self)
-        self.remove_value_map(constraint.bound)
-
-        del self.bounded_non_terminals[constraint.bound]
+        with self.bind(constraint.bound, constraint.search, exists=True):
+            constraint.statement.accept(self)
 
         transformed_constraints = self.results
         self.results = []  # Reset for independent processing
@@ -551,9 +942,7 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         all_conjunctions = all_combinations(all_transformed_constraints)
 
         for conjunction in all_conjunctions:
-            self.results.append(
-                ConjunctionConstraint(constraints=conjunction)
-            )
+            self.results.append(ConjunctionConstraint(constraints=conjunction))
 
     def visit_implication_constraint(self, constraint: "ImplicationConstraint"):
         """
@@ -579,18 +968,43 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         """
         self.results.append(constraint)
 
+    def get_values(
+        self,
+        search: "RuleSearch | AttributeSearch",
+        tree: DerivationTree,
+        scope: Optional[Dict[NonTerminal, DerivationTree]] = None,
+    ) -> List:
+        """
+        Returns the evaluated matches of the search in the tree. Unscoped rule searches only
+        depend on the tree and the symbol, so their values are cached across patterns.
+        """
+        if scope is not None or type(search) is not RuleSearch:
+            return [
+                container.evaluate() for container in search.find(tree, scope=scope)
+            ]
+        key = (id(tree), search.symbol)
+        values = self._find_cache.get(key)
+        if values is None:
+            values = self._find_cache[key] = [
+                container.evaluate() for container in search.find(tree, scope=scope)
+            ]
+        return values
+
     def get_combinations(
         self,
-        constraint: Constraint,
+        searches: Mapping[str, "RuleSearch | AttributeSearch"],
         tree: DerivationTree,
         scope: Optional[Dict[NonTerminal, DerivationTree]] = None,
     ):
+        """
+        Returns all combinations of (name, value) pairs for the searches.
+        """
         nodes: List[List[Tuple[str, DerivationTree]]] = []
-        for name, search in constraint.searches.items():
-            if isinstance(search, RuleSearch) and search.symbol == NonTerminal("<INTEGER>"):
+        for name, search in searches.items():
+            if isinstance(search, RuleSearch) and search.symbol == INTEGER_PLACEHOLDER:
                 continue
             nodes.append(
-                [(name, container) for container in search.find(tree, scope=scope)]
+                [(name, value) for value in self.get_values(search, tree, scope)]
             )
         return itertools.product(*nodes)
 
@@ -598,24 +1012,54 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         """This function is used to evaluate the partial constraints"""
         results = set()
 
-        try:
-            tmp_constraint = deepcopy(constraint)
-        except TypeError as e:
-            return set()
-        for name, search in tmp_constraint.searches.items():
-            if isinstance(search, AttributeSearch):
-                search.base = RuleSearch(self.bounded_non_terminals[search.base.symbol])
+        # Searches are never mutated, so only the attribute searches are rebuilt with
+        # their bound non-terminal instead of deep-copying the whole constraint
+        searches = {
+            name: (
+                AttributeSearch(
+                    RuleSearch(self.bounded_non_terminals[search.base.symbol]),
+                    search.attribute,
+                )
+                if isinstance(search, AttributeSearch)
+                else search
+            )
+            for name, search in constraint.searches.items()
+        }
 
+        # A bare search reference evaluates to the matched value itself; the other
+        # searches must then be rule searches, whose presence is checked below
+        name = constraint.left.strip()
+        direct = name in searches and all(
+            type(search) is RuleSearch
+            for other, search in searches.items()
+            if other != name
+        )
+        left = None if direct else compile_expression(constraint.left)
+        if left is None and not direct:
+            return results
+
+        required = frozenset(
+            search.symbol
+            for search in searches.values()
+            if isinstance(search, RuleSearch) and search.symbol != INTEGER_PLACEHOLDER
+        )
         for inp in self.test_inputs:
+            if not required <= inp.get_non_terminal_symbols():
+                # A search without matches yields no combinations for this input
+                continue
             scope = None
-            for combination in self.get_combinations(tmp_constraint, inp.tree, scope):
-                local_variables = tmp_constraint.local_variables.copy()
-                local_variables.update(
-                    {name: container.evaluate() for name, container in combination}
+            if direct:
+                results.update(
+                    str(value) for value in self.get_values(searches[name], inp.tree)
                 )
+                continue
+            # Every combination binds the same names, so one dict is updated in place
+            local_variables = constraint.local_variables.copy()
+            for combination in self.get_combinations(searches, inp.tree, scope):
+                local_variables.update(combination)
                 try:
                     left_result = eval(
-                        tmp_constraint.left, tmp_constraint.global_variables, local_variables
+                        left, constraint.global_variables, local_variables
                     )
                     results.add(str(left_result))
                 except Exception as e:
@@ -645,45 +1089,45 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
         """
         new_patterns = []
         for pattern, non_terminals in initialized_patterns:
+            # Split the searches into placeholders and the remaining searches in one pass
             matches = []
-            for name, search in pattern.searches.items():
-                if isinstance(search, RuleSearch):
-                    if search.symbol == placeholder:
-                        matches.append(name)
-
+            base_searches = {}
             non_terminals = set()
             for name, search in pattern.searches.items():
+                if isinstance(search, RuleSearch) and search.symbol == placeholder:
+                    matches.append(name)
+                    continue
+                base_searches[name] = search
                 if isinstance(search, RuleSearch):
-                    if search not in matches and search.symbol != placeholder:
-                        non_terminals.add(search.symbol)
+                    non_terminals.add(search.symbol)
                 elif isinstance(search, AttributeSearch):
-                    if search not in matches:
-                        non_terminals.add(search.attribute.symbol)
+                    non_terminals.add(search.attribute.symbol)
 
             if matches:
                 if isinstance(pattern, ComparisonConstraint):
+                    substitute = placeholder_substitution(matches)
+                    # The partial values only depend on the pattern, not on the non-terminal
+                    partial_values = (
+                        self.evaluate_partial(pattern) if non_terminals else set()
+                    )
+                    # The instantiated constraint only depends on the value, so values
+                    # shared by several non-terminals are instantiated only once
+                    vals = set(partial_values)
                     for non_terminal in non_terminals:
-                        vals = set(values.get(non_terminal, []))
-                        vals.update(self.evaluate_partial(pattern))
-
-                        for value in vals:
-                            updated_right = pattern.right
-                            for match in matches:
-                                updated_right = updated_right.replace(
-                                    match, format_value(value), 1
-                                )
-                            new_searches = deepcopy(pattern.searches)
-                            for match in matches:
-                                del new_searches[match]
-                            new_pattern = ComparisonConstraint(
-                                operator=pattern.operator,
-                                left=pattern.left,
-                                right=updated_right,
-                                searches=new_searches,
-                                local_variables=pattern.local_variables,
-                                global_variables=pattern.global_variables,
-                            )
-                            new_patterns.append((new_pattern, non_terminals))
+                        vals.update(values.get(non_terminal, ()))
+
+                    for value in vals:
+                        formatted_value = format_value(value)
+                        updated_right = substitute(pattern.right, formatted_value)
+                        new_pattern = ComparisonConstraint(
+                            operator=pattern.operator,
+                            left=pattern.left,
+                            right=updated_right,
+                            searches=dict(base_searches),
+                            local_variables=pattern.local_variables,
+                            global_variables=pattern.global_variables,
+                        )
+                        new_patterns.append((new_pattern, non_terminals))
                 else:
                     raise ValueError(
                         f"Only comparison constraints are supported. "
@@ -697,19 +1141,17 @@ class ValuePlaceholderTransformer(ConstraintVisitor, ABC):
 
 class IntegerValuePlaceholderTransformer(ValuePlaceholderTransformer):
 
-    def __init__(self, value_maps: ValueMaps, test_inputs: Set[FandangoInput]):
-        super().__init__(value_maps, test_inputs)
+    def __init__(
+        self,
+        value_maps: ValueMaps,
+        test_inputs: Set[FandangoInput],
+        find_cache: Optional[Dict[Tuple[int, NonTerminal], List]] = None,
+    ):
+        super().__init__(value_maps, test_inputs, find_cache)
 
     def update_value_map(self, bound: NonTerminal, search: RuleSearch):
         """ """
-        if search.symbol in self.value_maps._int_values:
-            self.value_maps._int_values[bound] = self.value_maps._int_values[
-                search.symbol
-            ]
-
-    def remove_value_map(self, bound: NonTerminal):
-        if bound in self.value_maps._int_values:
-            del self.value_maps._int_values[bound]
+        self.value_maps.alias_int_values(bound, search.symbol)
 
     def visit_comparison_constraint(self, constraint: "ComparisonConstraint"):
         """
@@ -718,13 +1160,17 @@ class IntegerValuePlaceholderTransformer(ValuePlaceholderTransformer):
         :return:
         """
 
+        if not self.has_placeholder(constraint, INTEGER_PLACEHOLDER):
+            self.results.append(constraint)
+            return
+
         instantiated_patterns = [(constraint, set())]
         # Replace <INTEGER> placeholders
         instantiated_patterns = self.replace_placeholders(
             instantiated_patterns,
-            NonTerminal("<INTEGER>"),
+            INTEGER_PLACEHOLDER,
             values=self.value_maps.get_filtered_int_values(),
-            format_value=lambda x: f"{x}",
+            format_value=str,
         )
 
         self.results.extend([pattern for pattern, _ in instantiated_patterns])
@@ -732,8 +1178,13 @@ class IntegerValuePlaceholderTransformer(ValuePlaceholderTransformer):
 
 class StringValuePlaceholderTransformer(ValuePlaceholderTransformer):
 
-    def __init__(self, value_maps: ValueMaps, test_inputs: Set[FandangoInput]):
-        super().__init__(value_maps, test_inputs)
+    def __init__(
+        self,
+        value_maps: ValueMaps,
+        test_inputs: Set[FandangoInput],
+        find_cache: Optional[Dict[Tuple[int, NonTerminal], List]] = None,
+    ):
+        super().__init__(value_maps, test_inputs, find_cache)
 
     def update_value_map(self, bound: NonTerminal, search: RuleSearch):
         """ """
@@ -742,28 +1193,29 @@ class StringValuePlaceholderTransformer(ValuePlaceholderTransformer):
                 search.symbol
             ]
 
-    def remove_value_map(self, bound: NonTerminal):
-        if bound in self.value_maps._string_values:
-            del self.value_maps._string_values[bound]
-
     def visit_comparison_constraint(self, constraint: "ComparisonConstraint"):
         """
         Replace placeholders in a ComparisonConstraint with corresponding values.
         :param constraint:
         :return:
         """
+        if not self.has_placeholder(constraint, STRING_PLACEHOLDER):
+            self.results.append(constraint)
+            return
+
         instantiated_patterns = [(constraint, set())]
         # Replace <STRING> placeholders
         instantiated_patterns = self.replace_placeholders(
             instantiated_patterns,
-            NonTerminal("<STRING>"),
+            STRING_PLACEHOLDER,
             values=self.value_maps.get_string_values(),
-            format_value=lambda x: f"'{x}'",
+            format_value=quote_value,
         )
 
         self.results.extend([pattern for pattern, _ in instantiated_patterns])
 
     @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
     def escape_string(s):
         return s.encode("unicode_escape").decode("utf-8")
 
@@ -771,40 +1223,33 @@ class StringValuePlaceholderTransformer(ValuePlaceholderTransformer):
 
         new_patterns = []
 
-        matches = [
-            key
-            for key in constraint.searches.keys()
-            if constraint.searches[key].symbol == NonTerminal("<STRING>")
-        ]
-
-        non_terminals = {
-            constraint.searches[key].symbol
-            for key in constraint.searches.keys()
-            if key not in matches
-        }
+        matches = []
+        base_searches = {}
+        for key, search in constraint.searches.items():
+            if search.symbol == STRING_PLACEHOLDER:
+                matches.append(key)
+            else:
+                base_searches[key] = search
+        non_terminals = {search.symbol for search in base_searches.values()}
 
         if matches:
+            substitute = placeholder_substitution(matches)
+            values = set()
             for non_terminal in non_terminals:
-                values = set(
+                values.update(
                     self.value_maps.get_string_values_for_non_terminal(non_terminal)
                 )
 
-                for value in values:
-                    new_expression = constraint.expression
-                    for match in matches:
-                        new_expression = new_expression.replace(
-                            match, "'" + self.escape_string(str(value)) + "'", 1
-                        )
-                    new_searches = deepcopy(constraint.searches)
-                    for match in matches:
-                        del new_searches[match]
-                    new_pattern = ExpressionConstraint(
-                        expression=new_expression,
-                        searches=new_searches,
-                        local_variables=constraint.local_variables,
-                        global_variables=constraint.global_variables,
-                    )
-                    new_patterns.append(new_pattern)
+            for value in values:
+                formatted_value = "'" + self.escape_string(str(value)) + "'"
+                new_expression = substitute(constraint.expression, formatted_value)
+                new_pattern = ExpressionConstraint(
+                    expression=new_expression,
+                    searches=dict(base_searches),
+                    local_variables=constraint.local_variables,
+                    global_variables=constraint.global_variables,
+                )
+                new_patterns.append(new_pattern)
         else:
             new_patterns.append(constraint)
         self.results.extend(new_patterns)
@@ -1,5 +1,6 @@
 from typing import List, Set, Dict, Any
 from abc import ABC, abstractmethod
+from functools import cached_property
 
 from fandango.language.tree import DerivationTree
 from fandango.language.grammar import (
@@ -110,9 +111,35 @@ class DerivationFeature(Feature):
         self.expansion = expansion
         self.grammar = grammar
 
+        # The parser for the non-trivial case is built lazily on first use; parse results are cached per subtree
+        self._parser = None
+        self._parse_results: Dict[str, int] = {}
+        self._expanded_expansion = (
+            repr(expansion.symbol)
+            if isinstance(expansion, (NonTerminalNode, TerminalNode))
+            else None
+        )
+
+    def __getstate__(self):
+        # The parser is rebuilt on demand and does not need to be shipped to other processes
+        state = self.__dict__.copy()
+        state["_parser"] = None
+        return state
+
     def _repr(self) -> str:
         return f"exists({self.non_terminal} -> {self.expansion})"
 
+    @cached_property
+    def _is_trivial_rule(self) -> bool:
+        return not isinstance(self.grammar[self.non_terminal], Alternative)
+
+    def _get_parser(self):
+        if self._parser is None:
+            new_rules = self.grammar.rules.copy()
+            new_rules[self.non_terminal] = self.expansion
+            self._parser = Grammar.Parser(Grammar(rules=new_rules))
+        return self._parser
+
     @property
     def default_value(self):
         return 0
@@ -138,31 +165,28 @@ class DerivationFeature(Feature):
 
         # If the production rule for the non-terminal is not an alternative, we can immediately return 1
         # This is because the expansion of the non-terminal is a single node and it allways has to match the subtree
-        if not isinstance(self.grammar[self.non_terminal], Alternative):
+        if self._is_trivial_rule:
             return 1
 
         # If the expansion of the non-terminal is a terminal or non-terminal, we can compare the subtree with the
         # expansion; ff they match, we can return 1 else 0
-        if isinstance(self.expansion, NonTerminalNode) or isinstance(
-            self.expansion, TerminalNode
-        ):
-            # visitor = ExpansionVisitor()
+        if self._expanded_expansion is not None:
             children = subtree.children
             expanded_subtree = " ".join([repr(child.symbol) for child in children])
-            # expanded_expansion = "".join([str(child) for child in visitor.visit(self.expansion)])
-            expanded_expansion = repr(self.expansion.symbol)
-            if expanded_expansion == expanded_subtree:
+            if self._expanded_expansion == expanded_subtree:
                 return 1
             return 0
 
         # If the expansion is an Alternative and consists not of trivial NonTerminal or Terminal nodes, we need to parse
         # the subtree with the expansion of the non-terminal and check if the parsed tree exists.
-        new_rules = self.grammar.rules.copy()
-        new_rules[self.non_terminal] = self.expansion
-        parsed = Grammar.Parser(Grammar(rules=new_rules)).parse(
-            str(subtree), start=self.non_terminal
-        )
-        if parsed:
+        # Identical subtrees recur often, so the result is cached by the subtree's string.
+        key = str(subtree)
+        result = self._parse_results.get(key)
+        if result is None:
+            parsed = self._get_parser().parse(key, start=self.non_terminal)
+            result = 1 if parsed else 0
+            self._parse_results[key] = result
+        if result:
             return 1
 
         # visitor = ExpansionVisitor()
@@ -418,7 +442,9 @@ def get_direct_reachable_non_terminals(
     return reachable
 
 
-def get_direct_reachability_map(grammar: Grammar) -> dict[NonTerminal, Set[NonTerminal]]:
+def get_direct_reachability_map(
+    grammar: Grammar,
+) -> dict[NonTerminal, Set[NonTerminal]]:
     """
     Get the reachability map for a given grammar.
 
@@ -431,4 +457,4 @@ def get_direct_reachability_map(grammar: Grammar) -> dict[NonTerminal, Set[NonTe
             grammar, non_terminal
         )
 
-    return reachability_map
\ No newline at end of file
+    return reachability_map
@@ -1,9 +1,8 @@
-from functools import lru_cache
-from typing import List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 from abc import ABC, abstractmethod
 
 from fandango.language.grammar import Grammar
-from fandango.language.symbol import NonTerminal, Symbol
+from fandango.language.symbol import NonTerminal
 from fandango.language.tree import DerivationTree
 
 from fdlearn.data import FandangoInput
@@ -17,7 +16,6 @@ from fdlearn.reduction.feature_class import (
     FeatureVector,
 )
 
-
 DEFAULT_FEATURE_TYPES: List[Type[Feature]] = [
     ExistenceFeature,
     DerivationFeature,
@@ -43,6 +41,14 @@ class FeatureCollector(ABC):
         feature_types = feature_types if feature_types else DEFAULT_FEATURE_TYPES
         self.features = self.construct_features(feature_types)
 
+        features_by_nt: Dict[NonTerminal, List[Feature]] = {}
+        for feature in self.features:
+            features_by_nt.setdefault(feature.non_terminal, []).append(feature)
+        self._features_by_nt: Dict[NonTerminal, Tuple[Feature, ...]] = {
+            non_terminal: tuple(features)
+            for non_terminal, features in features_by_nt.items()
+        }
+
     def construct_features(self, feature_types: List[Type[Feature]]) -> List[Feature]:
         """
         Constructs the features based on the given feature types.
@@ -88,29 +94,30 @@ class GrammarFeatureCollector(FeatureCollector):
         :param feature_vector: The feature vector to set the features in.
         :return: None
         """
-        node: Symbol = tree.symbol
-        children = tree.children
-        assert isinstance(node, NonTerminal)
-
-        corresponding_features_1d = self.get_corresponding_feature(node)
-
-        for corresponding_feature in corresponding_features_1d:
-            value = corresponding_feature.evaluate(tree)
-            feature_vector.set_feature(corresponding_feature, value)
-
-        for child in children:
-            if isinstance(child.symbol, NonTerminal):
-                self.set_features(child, feature_vector)
-
-    @lru_cache
-    def get_corresponding_feature(self, current_node: NonTerminal) -> List[Feature]:
+        assert isinstance(tree.symbol, NonTerminal)
+
+        # Walk the tree with an explicit stack; feature values are merged with max, so the visiting order is irrelevant
+        features_by_nt = self._features_by_nt
+        set_feature = feature_vector.set_feature
+        stack: List[DerivationTree] = [tree]
+        while stack:
+            subtree = stack.pop()
+            for corresponding_feature in features_by_nt.get(subtree.symbol, ()):
+                set_feature(
+                    corresponding_feature, corresponding_feature.evaluate(subtree)
+                )
+            stack.extend(
+                child
+                for child in subtree.children
+                if isinstance(child.symbol, NonTerminal)
+            )
+
+    def get_corresponding_feature(
+        self, current_node: NonTerminal
+    ) -> Tuple[Feature, ...]:
         """
         Returns the features that are relevant to the current node.
         :param current_node: The current node for which to get the features.
-        :return: A list of features that are relevant to the current node.
+        :return: A tuple of features that are relevant to the current node.
         """
-        return [
-            feature
-            for feature in self.features
-            if (feature.non_terminal == current_node)
-        ]
+        return self._features_by_nt.get(current_node, ())
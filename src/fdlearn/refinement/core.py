@@ -88,6 +88,8 @@ class HypothesisInputFeatureDebugger(InputFeatureDebugger, ABC):
         """
         Set the runner for the hypothesis-based input feature debugger.
         """
+        if runner is not self.runner:
+            self.runner.shutdown()
         self.runner = runner
 
     def set_learner(self, learner: ConstraintCandidateLearner):
@@ -158,6 +160,7 @@ class HypothesisInputFeatureDebugger(InputFeatureDebugger, ABC):
         except Exception as e:
             logging.error(e)
         finally:
+            self.runner.shutdown()
             return self.get_best_candidates()
 
     def prepare_test_inputs(self) -> Set[FandangoInput]:
@@ -233,7 +236,7 @@ class HypothesisInputFeatureDebugger(InputFeatureDebugger, ABC):
         """
         Convert a list of input strings to a set of Input objects.
         """
-        return set([FandangoInput.from_str(self.grammar, inp, None) for inp in inputs])
+        return FandangoInput.from_str_batch(self.grammar, inputs)
 
     @staticmethod
     def check_initial_conditions(test_inputs: Set[FandangoInput]):
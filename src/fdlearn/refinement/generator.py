@@ -47,7 +47,10 @@ class Generator(ABC):
                     candidate = candidate_queue.get_nowait()
                     LOGGER.debug(f"Got candidate: {candidate}")
                     test_inputs = self.generate_test_inputs(candidate=candidate)
-                    output_queue.put(test_inputs)
+                    if hasattr(output_queue, "put"):
+                        output_queue.put(test_inputs)
+                    else:
+                        output_queue.append(test_inputs)
                 except Empty:
                     LOGGER.debug("Candidate queue empty, exiting.")
                     break
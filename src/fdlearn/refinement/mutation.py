@@ -11,12 +11,14 @@ from fandango.language.tree import DerivationTree
 from fdlearn.data import FandangoInput, OracleResult
 from fdlearn.types import OracleType
 
-
 LOGGER = logging.getLogger("fandango-mutation-fuzzer")
 Path = tuple[int, ...]
+Fragments = dict[NonTerminal, tuple[list[DerivationTree], dict[str, int]]]
 
 
 class Operator(ABC):
+    # Whether a failed replacement at a path fails again on the same tree
+    deterministic: bool = False
 
     def __init__(self):
         pass
@@ -29,32 +31,34 @@ class Operator(ABC):
 
 
 class ReplaceFragmentOperator(Operator):
+    deterministic = True
 
-    def __init__(self, fragments: dict[NonTerminal, set[DerivationTree]]):
+    def __init__(self, fragments: Fragments):
         super().__init__()
 
     def replace(
         self,
         inp: DerivationTree,
         path: Path,
-        fragments: dict[NonTerminal, list[DerivationTree]] = dict,
+        fragments: Optional[Fragments] = None,
         **kwargs,
     ) -> DerivationTree | None:
         subtree = get_subtree(inp, path)
-        if not isinstance(subtree.symbol, NonTerminal):
+        if not isinstance(subtree.symbol, NonTerminal) or not fragments:
             return None
 
-        different_fragments = [
-            fragment
-            for fragment in fragments.get(subtree.symbol, [])
-            if fragment and not str(fragment) == str(subtree)
-        ]
-
-        if not different_fragments:
+        trees, index = fragments.get(subtree.symbol, ((), {}))
+        current = index.get(str(subtree))
+        num_candidates = len(trees) if current is None else len(trees) - 1
+        if num_candidates <= 0:
             return None
 
-        fragment = random.choice(different_fragments)
-        result = replace_subtree(inp, path, fragment)
+        # Pick uniformly among all fragments except the current subtree
+        j = random.randrange(num_candidates)
+        if current is not None and j >= current:
+            j += 1
+
+        result = replace_subtree(inp, path, trees[j])
         return result
 
 
@@ -80,6 +84,7 @@ class ReplaceRandomSubtreeOperator(Operator):
 
 
 class SwapSubtreeOperator(Operator):
+    deterministic = True
 
     def __init__(self):
         super().__init__()
@@ -103,29 +108,38 @@ class SwapSubtreeOperator(Operator):
 
 
 def traverse(tree: DerivationTree, action, path: Path = ()):
-    action(path, tree)
-    for i, child in enumerate(tree.children):
-        traverse(child, action, path + (i,))
+    for node_path, node in get_paths(tree, path):
+        action(node_path, node)
 
 
-def get_paths(tree: DerivationTree) -> list[tuple[Path, DerivationTree]]:
+def get_paths(
+    tree: DerivationTree, path: Path = ()
+) -> list[tuple[Path, DerivationTree]]:
     result: list[tuple[Path, DerivationTree]] = []
+    stack = [(path, tree)]
+    while stack:
+        node_path, node = stack.pop()
+        result.append((node_path, node))
+        children = node.children
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((node_path + (i,), children[i]))
+    return result
 
-    def action(path, node):
-        result.append((path, node))
 
-    traverse(tree, action)
-    return result
+def get_non_terminal_paths(tree: DerivationTree) -> list[Path]:
+    return [
+        path
+        for path, subtree in get_paths(tree)
+        if isinstance(subtree.symbol, NonTerminal)
+    ]
 
 
 def get_subtree(tree: DerivationTree, path: tuple[int, ...]):
     curr_node = tree
-    while path:
+    for index in path:
         if not curr_node.children:
             return None
-
-        curr_node = curr_node.children[path[0]]
-        path = path[1:]
+        curr_node = curr_node.children[index]
 
     return curr_node
 
@@ -136,21 +150,24 @@ def replace_subtree(
     if not path:
         return deepcopy(subtree)  # If path is empty, replace the entire tree
 
-    def helper(node: DerivationTree, current_path: tuple[int, ...]) -> DerivationTree:
-        if not current_path:  # If we reached the target node, return the new subtree
-            return deepcopy(subtree)
+    ancestors: list[tuple[DerivationTree, int]] = []
+    node = tree
+    for index in path:
+        if not node.children or index >= len(node.children):
+            replacement = deepcopy(node)  # If invalid path, keep a copy of the node
+            break
+        ancestors.append((node, index))
+        node = node.children[index]
+    else:
+        replacement = deepcopy(subtree)
 
-        if not node.children or current_path[0] >= len(node.children):
-            return deepcopy(node)  # If invalid path, return a copy of the node
+    # Rebuild only the nodes along the path, sharing all other children
+    for parent, index in reversed(ancestors):
+        new_children = list(parent.children)
+        new_children[index] = replacement
+        replacement = DerivationTree(parent.symbol, new_children)
 
-        new_children = list(node.children)
-        new_children[current_path[0]] = helper(
-            node.children[current_path[0]], current_path[1:]
-        )
-
-        return DerivationTree(node.symbol, new_children)
-
-    return helper(tree, path)
+    return replacement
 
 
 class MutationFuzzer:
@@ -170,7 +187,8 @@ class MutationFuzzer:
         self.max_mutations = max_mutations
 
         self.population: list[FandangoInput] = list()
-        self.fragments: dict[NonTerminal, list[DerivationTree]] = {}
+        self.fragments: Fragments = {}
+        self.non_terminal_paths: dict[FandangoInput, list[Path]] = {}
 
         self.reset()
 
@@ -186,42 +204,78 @@ class MutationFuzzer:
                 self.population.append(inp)
 
         self.fragments = {}
+        self.non_terminal_paths = {}
 
         for seed in self.population:
             self.update_fragments(seed)
 
     def update_fragments(self, inp: FandangoInput):
-        for _, subtree in get_paths(inp.tree):
+        # Collect the fragments and the non-terminal paths in a single walk
+        paths: list[Path] = []
+        for path, subtree in get_paths(inp.tree):
             if isinstance(subtree.symbol, NonTerminal):
-                if subtree.symbol not in self.fragments:
-                    self.fragments.setdefault(subtree.symbol, []).append(subtree)
+                paths.append(path)
+                trees, index = self.fragments.setdefault(subtree.symbol, ([], {}))
+                fragment = str(subtree)
+                if fragment not in index:
+                    index[fragment] = len(trees)
+                    trees.append(subtree)
+        self.non_terminal_paths[inp] = paths
 
     def fuzz(self) -> FandangoInput:
         num_mutations = random.randint(self.min_mutations, self.max_mutations)
-        curr_inp = random.choice(self.population)
+        max_attempts = num_mutations * 4
+        seed = random.choice(self.population)
+        # Intermediate mutations work on bare trees, only the result is wrapped
+        curr_tree, curr_paths = seed.tree, self.non_terminal_paths.get(seed)
+        failed: set[tuple[int, Path]] = set()
         mutations = 0
-        while mutations < num_mutations:
-            maybe_result = self.mutate(curr_inp)
+        attempts = 0
+        while mutations < num_mutations and attempts < max_attempts:
+            attempts += 1
+            maybe_result = self.mutate_tree(curr_tree, curr_paths, failed)
             if maybe_result is not None:
-                curr_inp = maybe_result
+                curr_tree, curr_paths = maybe_result, None
                 mutations += 1
-        return curr_inp
-
-    def mutate(self, inp: FandangoInput) -> FandangoInput | None:
-        tree = inp.tree
-        paths = [
-            path
-            for path, subtree in get_paths(inp.tree)
-            if isinstance(subtree.symbol, NonTerminal)
-        ]
-
-        random.shuffle(paths)  # Randomize order to avoid bias
-
-        for path in paths:
-            operator: Operator = random.choice(self.mutation_operators)
+                failed = set()
+            elif mutations == 0:
+                # No mutation applies to this input, start over from another one
+                seed = random.choice(self.population)
+                curr_tree, curr_paths = seed.tree, self.non_terminal_paths.get(seed)
+                failed = set()
+        return seed if mutations == 0 else FandangoInput(tree=curr_tree)
+
+    def mutate(
+        self, inp: FandangoInput, failed: Optional[set[tuple[int, Path]]] = None
+    ) -> FandangoInput | None:
+        new_tree = self.mutate_tree(inp.tree, self.non_terminal_paths.get(inp), failed)
+        return FandangoInput(tree=new_tree) if new_tree is not None else None
+
+    def mutate_tree(
+        self,
+        tree: DerivationTree,
+        paths: Optional[list[Path]] = None,
+        failed: Optional[set[tuple[int, Path]]] = None,
+    ) -> DerivationTree | None:
+        paths = list(paths) if paths is not None else get_non_terminal_paths(tree)
+
+        # Draw paths lazily (partial Fisher-Yates) and stop at the first success
+        remaining = len(paths)
+        while remaining:
+            j = random.randrange(remaining)
+            path = paths[j]
+            remaining -= 1
+            paths[j], paths[remaining] = paths[remaining], path
+
+            op_idx = random.randrange(len(self.mutation_operators))
+            if failed is not None and (op_idx, path) in failed:
+                continue
+            operator: Operator = self.mutation_operators[op_idx]
             new_tree = operator.replace(tree, path, fragments=self.fragments)
             if new_tree is not None:
-                return FandangoInput(tree=new_tree)
+                return new_tree
+            if failed is not None and operator.deterministic:
+                failed.add((op_idx, path))
 
         return None
 
@@ -19,17 +19,23 @@ def construct_negations(candidates: list[FandangoConstraintCandidate]):
     :return:
     """
     result = []
+    seen: set[FandangoConstraintCandidate] = set()
     for candidate in candidates:
         if isinstance(candidate.constraint, ConjunctionConstraint):
-            result.extend(construct_negations_from_conjunctions(candidate))
+            negations = construct_negations_from_conjunctions(candidate)
         elif isinstance(candidate.constraint, DisjunctionConstraint):
-            result.extend(construct_negation_from_disjunction(candidate))
+            negations = construct_negation_from_disjunction(candidate)
         elif isinstance(candidate.constraint, ComparisonConstraint):
-            result.append(negate_comparison_constraint(candidate))
+            negations = [negate_comparison_constraint(candidate)]
         else:
-            result.append(
+            negations = [
                 FandangoConstraintCandidate(NegationConstraint(candidate.constraint))
-            )
+            ]
+
+        for negation in negations:
+            if negation not in seen:
+                seen.add(negation)
+                result.append(negation)
 
     return result
 
@@ -87,16 +93,18 @@ def construct_negation_from_disjunction(candidate: FandangoConstraintCandidate):
     return results
 
 
+_NEGATED_COMPARISONS = {
+    Comparison.EQUAL: Comparison.NOT_EQUAL,
+    Comparison.NOT_EQUAL: Comparison.EQUAL,
+    Comparison.GREATER: Comparison.LESS_EQUAL,
+    Comparison.GREATER_EQUAL: Comparison.LESS,
+    Comparison.LESS: Comparison.GREATER_EQUAL,
+    Comparison.LESS_EQUAL: Comparison.GREATER,
+}
+
+
 def negate_comparison_operator(operator: Comparison) -> Comparison:
-    negation_map = {
-        Comparison.EQUAL: Comparison.NOT_EQUAL,
-        Comparison.NOT_EQUAL: Comparison.EQUAL,
-        Comparison.GREATER: Comparison.LESS_EQUAL,
-        Comparison.GREATER_EQUAL: Comparison.LESS,
-        Comparison.LESS: Comparison.GREATER_EQUAL,
-        Comparison.LESS_EQUAL: Comparison.GREATER,
-    }
-    return negation_map[operator]
+    return _NEGATED_COMPARISONS[operator]
 
 
 def negate_comparison_constraint(
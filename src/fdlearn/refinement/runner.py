@@ -1,5 +1,7 @@
+import pickle
 from abc import ABC, abstractmethod
-from typing import Union, Set
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Union, Set, Optional
 
 from fdlearn.data import FandangoInput, OracleResult
 from fdlearn.types import OracleType, BatchOracleType
@@ -16,17 +18,76 @@ class ExecutionHandler(ABC):
     def label(self, **kwargs):
         raise NotImplementedError
 
+    def shutdown(self):
+        """
+        Releases the resources held by the handler.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
 
 class SingleExecutionHandler(ExecutionHandler):
+    """
+    Labels every input by calling the oracle on it. With more than one worker, the
+    oracle calls are distributed over a process pool. If the oracle or the inputs
+    cannot be pickled, a thread pool is used instead.
+
+    In a process pool, every worker labels with its own copy of the oracle, so state
+    the oracle keeps between calls is not shared. The pool is owned by the handler and
+    released by shutdown() or by leaving a with block.
+    """
+
+    def __init__(
+        self,
+        oracle: OracleType,
+        workers: Optional[int] = 1,
+    ):
+        super().__init__(oracle)
+        self.workers: int = max(1, workers or 1)
+        self._pool: Optional[Executor] = None
+
     def _get_label(self, test_input: Union[FandangoInput]) -> OracleResult:
         return self.oracle(test_input)
 
+    def _get_pool(self, sample: FandangoInput) -> Executor:
+        if self._pool is None:
+            try:
+                pickle.dumps(self)
+                pickle.dumps(sample)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def __getstate__(self):
+        # The pool stays with the handler in the parent process
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
     def label(self, test_inputs: Set[FandangoInput], **kwargs):
-        for inp in test_inputs:
-            label = self._get_label(inp)
+        inputs = list(test_inputs)
+        if self.workers == 1 or len(inputs) < 2:
+            labels = [self._get_label(inp) for inp in inputs]
+        else:
+            chunksize = max(1, len(inputs) // (4 * self.workers))
+            pool = self._get_pool(inputs[0])
+            labels = list(pool.map(self._get_label, inputs, chunksize=chunksize))
+
+        for inp, label in zip(inputs, labels):
             inp.oracle = label
         return test_inputs
 
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
 
 class BatchExecutionHandler(ExecutionHandler):
     def _get_label(
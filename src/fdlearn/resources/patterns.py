@@ -15,7 +15,8 @@ class Pattern:
     New patterns can be added by creating a new instance of this class.
     They will be automatically added to the registry.
     By providing the instantiated patterns, the setup of the learner is significantly faster, since the patterns
-    are already instantiated. Parsing the patterns is expensive and a time-consuming process.
+    are already instantiated. Parsing the patterns is expensive and a time-consuming process, so patterns
+    without an instantiation are only parsed when they are first used.
     """
 
     registry = []
@@ -27,11 +28,15 @@ class Pattern:
         use_cache: bool = True,
     ):
         self.string_pattern = string_pattern
-        self.instantiated_pattern = instantiated_pattern or parse_constraint(
-            string_pattern
-        )
+        self._instantiated_pattern = instantiated_pattern
         self.__class__.registry.append(self)
 
+    @property
+    def instantiated_pattern(self) -> Constraint:
+        if self._instantiated_pattern is None:
+            self._instantiated_pattern = parse_constraint(self.string_pattern)
+        return self._instantiated_pattern
+
     @classmethod
     def get_id(cls, i):
         return f"___fandango_01_{i}___"
@@ -135,8 +140,7 @@ Pattern(
     use_cache=False,
 )
 
-Pattern(
-    string_pattern="""
+Pattern(string_pattern="""
 def iban_checksum(country: str, bban: str) -> str:
     moved = bban + country + "00"
     numeric = "".join(str(int(ch, 36)) for ch in moved)
@@ -144,12 +148,11 @@ def iban_checksum(country: str, bban: str) -> str:
     return 98 - remainder
 
 where iban_checksum(str(<NON_TERMINAL>),str(<NON_TERMINAL>)) == int(<NON_TERMINAL>)
-"""
-)
+""")
 
 pattern = [
     Pattern(
         string_pattern="""exists <elem> in <NON_TERMINAL>: (str(<ATTRIBUTE>) == <STRING>) and (int(eval(str(<ATTRIBUTE>))) == <INTEGER>);
         """
     )
-]
\ No newline at end of file
+]
@@ -5,7 +5,12 @@ from fandango.evolution.algorithm import Fandango
 
 from fdlearn.data import FandangoInput, OracleResult
 from fdlearn.language.constraints import NegationConstraint
-from fdlearn.learning.candidate import FandangoConstraintCandidate, CandidateSet
+from fdlearn.learning.candidate import (
+    FandangoConstraintCandidate,
+    CandidateSet,
+    InputRegistry,
+    batch_counts,
+)
 from fdlearn.interface.fandango import parse_contents, parse_constraint
 
 
@@ -45,8 +50,8 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
         self.candidate.evaluate(inputs)
 
         # Check if evaluation results are recorded correctly
-        self.assertEqual(self.candidate.failing_inputs_eval_results, [True])
-        self.assertEqual(self.candidate.passing_inputs_eval_results, [False])
+        self.assertEqual(self.candidate.failing_inputs_eval_results.tolist(), [True])
+        self.assertEqual(self.candidate.passing_inputs_eval_results.tolist(), [False])
 
         for key, value in self.candidate.cache.items():
             self.assertEqual(key.oracle.is_failing(), value)
@@ -54,14 +59,26 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
     def test_many_evaluate(self):
         inputs = []
         for _ in range(100):
-                inputs.append(FandangoInput.from_str(
-                    self.grammar, "sqrt(-900)", OracleResult.FAILING
-                ))
+            inputs.append(
+                FandangoInput.from_str(self.grammar, "sqrt(-900)", OracleResult.FAILING)
+            )
 
         for _ in range(10):
             self.candidate = FandangoConstraintCandidate(self.constraint)
             self.candidate.evaluate(inputs)
 
+    def test_evaluate_structurally_equal_inputs(self):
+        duplicate_input = FandangoInput.from_str(
+            self.grammar, "sqrt(-900)", OracleResult.FAILING
+        )
+        self.assertIsNot(duplicate_input, self.failing_input)
+
+        self.candidate.evaluate(
+            [self.failing_input, duplicate_input, self.passing_input]
+        )
+        self.assertEqual(len(self.candidate.cache), 2)
+        self.assertEqual(self.candidate.failing_inputs_eval_results.tolist(), [True])
+
     def test_precision(self):
         inputs = [self.failing_input, self.passing_input]
         self.candidate.evaluate(inputs)
@@ -103,8 +120,12 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
         combined_candidate = candidate & other_candidate
 
         # Verify the combined constraint evaluates correctly
-        self.assertEqual(combined_candidate.failing_inputs_eval_results, [True])
-        self.assertEqual(combined_candidate.passing_inputs_eval_results, [False])
+        self.assertEqual(
+            combined_candidate.failing_inputs_eval_results.tolist(), [True]
+        )
+        self.assertEqual(
+            combined_candidate.passing_inputs_eval_results.tolist(), [False]
+        )
 
         for key, value in self.candidate.cache.items():
             self.assertEqual(key.oracle.is_failing(), value)
@@ -127,8 +148,12 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
         combined_candidate = candidate | other_candidate
 
         # Verify the combined constraint evaluates correctly
-        self.assertEqual(combined_candidate.failing_inputs_eval_results, [True])
-        self.assertEqual(combined_candidate.passing_inputs_eval_results, [True])
+        self.assertEqual(
+            combined_candidate.failing_inputs_eval_results.tolist(), [True]
+        )
+        self.assertEqual(
+            combined_candidate.passing_inputs_eval_results.tolist(), [True]
+        )
 
         # Not a perfect constraint
         self.assertEqual(combined_candidate.cache[self.failing_input], True)
@@ -147,6 +172,30 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
         self.assertEqual(negated_candidate.cache[self.failing_input], False)
         self.assertEqual(negated_candidate.cache[self.passing_input], True)
 
+        double_negated_candidate = -negated_candidate
+        self.assertEqual(double_negated_candidate, candidate)
+        self.assertEqual(double_negated_candidate.cache, candidate.cache)
+
+    def test_get(self):
+        self.candidate.evaluate([self.failing_input])
+        self.assertEqual(self.candidate.get(self.failing_input), True)
+        self.assertIsNone(self.candidate.get(self.passing_input))
+
+        self.candidate.evaluate([self.passing_input])
+        self.assertEqual(self.candidate.get(self.passing_input), False)
+
+    def test_batch_counts(self):
+        inputs = [self.failing_input, self.passing_input]
+        other_candidate = FandangoConstraintCandidate(
+            parse_constraint("str(<function>) == 'sqrt';")
+        )
+        for candidate in [self.candidate, other_candidate]:
+            candidate.evaluate(inputs)
+
+        counts = batch_counts([self.candidate, other_candidate])
+        self.assertEqual(counts.tolist(), [[1, 1, 1, 0], [1, 1, 1, 1]])
+        self.assertEqual(other_candidate.precision(), 0.5)
+
     def test_reset(self):
         inputs = [self.failing_input, self.passing_input]
         self.candidate.evaluate(inputs)
@@ -155,10 +204,50 @@ class TestFandangoConstraintCandidate(unittest.TestCase):
         self.candidate.reset()
 
         # Check if results are cleared
-        self.assertEqual(self.candidate.failing_inputs_eval_results, [])
-        self.assertEqual(self.candidate.passing_inputs_eval_results, [])
+        self.assertEqual(self.candidate.failing_inputs_eval_results.tolist(), [])
+        self.assertEqual(self.candidate.passing_inputs_eval_results.tolist(), [])
         self.assertEqual(self.candidate.cache, {})
 
+    def test_reset_reuses_evaluations(self):
+        inputs = [self.failing_input, self.passing_input]
+        self.candidate.evaluate(inputs)
+        self.candidate.reset()
+
+        evaluation_cache = self.candidate.registry.evaluation_cache
+        misses = evaluation_cache.misses
+        self.candidate.evaluate(inputs)
+        self.assertEqual(evaluation_cache.misses, misses)
+        self.assertEqual(self.candidate.cache[self.failing_input], True)
+        self.assertEqual(self.candidate.cache[self.passing_input], False)
+
+    def test_relabeled_input(self):
+        registry = InputRegistry()
+        candidate = FandangoConstraintCandidate(self.constraint, registry=registry)
+        candidate.evaluate([self.failing_input, self.passing_input])
+        self.assertEqual(candidate.recall(), 1.0)
+
+        self.failing_input.update_oracle(OracleResult.PASSING)
+        candidate.evaluate([self.failing_input])
+        self.assertEqual(candidate.recall(), 0.0)
+        self.assertEqual(candidate.specificity(), 0.5)
+
+    def test_separate_registries(self):
+        registry = InputRegistry()
+        candidate = FandangoConstraintCandidate(self.constraint, registry=registry)
+        relabeled_input = FandangoInput.from_str(
+            self.grammar, "sqrt(-900)", OracleResult.PASSING
+        )
+        self.candidate.evaluate([self.failing_input, self.passing_input])
+        candidate.evaluate([relabeled_input, self.passing_input])
+
+        self.assertEqual(self.candidate.precision(), 1.0)
+        self.assertEqual(candidate.precision(), 0.0)
+        self.assertEqual(len(registry), 2)
+
+        registry.reset()
+        self.assertEqual(len(registry), 0)
+        self.assertIsNone(registry.get(relabeled_input))
+
     def test_str_representation(self):
         inputs = [self.failing_input, self.passing_input]
         self.candidate.evaluate(inputs)
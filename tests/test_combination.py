@@ -9,6 +9,7 @@ from fdlearn.learning.candidate import FandangoConstraintCandidate
 from fdlearn.learning.combination import (
     ConjunctionProcessor,
     DisjunctionProcessor,
+    deduplicate_candidates,
 )
 from fdlearn.learning.candidate import CandidateSet
 
@@ -57,6 +58,15 @@ class TestConjunctionProcessor(unittest.TestCase):
         result = self.processor.process(candidates)
         self.assertEqual(len(result), 1)
 
+    def test_process_with_workers(self):
+        candidates = CandidateSet([self.candidate1, self.candidate2, self.candidate3])
+        processor = ConjunctionProcessor(
+            max_conjunction_size=3, min_precision=0.6, min_recall=0.9, workers=2
+        )
+
+        result = processor.process(candidates)
+        self.assertEqual(result, self.processor.process(candidates))
+
     def test_get_possible_conjunctions(self):
         # Test the generation of possible conjunctions
         candidates = CandidateSet([self.candidate1, self.candidate2, self.candidate3])
@@ -66,6 +76,26 @@ class TestConjunctionProcessor(unittest.TestCase):
         expected_combination_count = 4  # C(1, 2), C(1, 3), C(2, 3), C(1, 2, 3)
         self.assertEqual(len(result), expected_combination_count)
 
+    def test_deduplicate_candidates(self):
+        candidate4 = FandangoConstraintCandidate(parse_constraint("int(<number>) < 0;"))
+        candidate4.evaluate(self.test_inputs)
+
+        result = deduplicate_candidates([self.candidate3, candidate4, self.candidate2])
+        self.assertEqual(len(result), 2)
+        self.assertIn(candidate4, result)
+        self.assertIn(self.candidate2, result)
+
+    def test_deduplicate_candidates_tie(self):
+        candidate4 = FandangoConstraintCandidate(parse_constraint("int(<number>) < 0;"))
+        candidate5 = FandangoConstraintCandidate(parse_constraint("0 > int(<number>);"))
+        for candidate in [candidate4, candidate5]:
+            candidate.evaluate(self.test_inputs)
+
+        result_1 = deduplicate_candidates([candidate4, candidate5])
+        result_2 = deduplicate_candidates([candidate5, candidate4])
+        self.assertEqual(len(result_1), 1)
+        self.assertEqual(result_1, result_2)
+
     def test_process_disjunctions(self):
         candidate1 = FandangoConstraintCandidate(
             parse_constraint("int(<number>) == -1;")
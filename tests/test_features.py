@@ -1,5 +1,6 @@
 import unittest
 import os
+import pickle
 
 from fandango.language.grammar import NonTerminalNode, TerminalNode, Concatenation
 from numpy import inf
@@ -439,6 +440,22 @@ class FeatureExtraction(unittest.TestCase):
             feature_vector = collector.collect_features(test_input)
             self.assertEqual(feature_vector.features, expected_feature_vectors)
 
+    def test_derivation_feature_cached_evaluation(self):
+        grammar, _ = parse(os.path.join(self.dirname, "resources", "calculator.fan"))
+        collector = GrammarFeatureCollector(grammar, [DerivationFeature])
+
+        test_input = FandangoInput.from_str(grammar, "sqrt(-900)")
+        first = collector.collect_features(test_input)
+        second = collector.collect_features(test_input)
+        self.assertEqual(first.features, second.features)
+
+        for feature in collector.features:
+            restored = pickle.loads(pickle.dumps(feature))
+            self.assertEqual(restored, feature)
+            self.assertEqual(
+                restored.evaluate(test_input.tree), feature.evaluate(test_input.tree)
+            )
+
     def test_features_calculator(self):
         grammar, _ = parse(os.path.join(self.dirname, "resources", "calculator.fan"))
 
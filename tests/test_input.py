@@ -0,0 +1,77 @@
+import unittest
+import os
+
+from fdlearn.data import FandangoInput, OracleResult
+from fdlearn.interface.fandango import parse_file
+
+
+class CountingGrammar:
+    """
+    Wraps a grammar and counts the calls to parse.
+    """
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.parse_calls = 0
+
+    def parse(self, *args, **kwargs):
+        self.parse_calls += 1
+        return self.grammar.parse(*args, **kwargs)
+
+
+class TestFandangoInput(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        file = os.path.join(os.path.dirname(__file__), "resources", "calculator.fan")
+        cls.grammar, _ = parse_file(file)
+
+    def test_from_str_parses_once(self):
+        grammar = CountingGrammar(self.grammar)
+        inp = FandangoInput.from_str(grammar, "sqrt(-1)", True)
+
+        self.assertEqual(grammar.parse_calls, 1)
+        self.assertEqual(str(inp), "sqrt(-1)")
+        self.assertEqual(inp.oracle, OracleResult.FAILING)
+
+    def test_from_str_invalid_input(self):
+        with self.assertRaises(SyntaxError):
+            FandangoInput.from_str(self.grammar, "sqrt(-1")
+
+    def test_from_str_equal_inputs(self):
+        inp_1 = FandangoInput.from_str(self.grammar, "cos(10)")
+        inp_2 = FandangoInput.from_str(self.grammar, "cos(10)")
+
+        self.assertEqual(inp_1, inp_2)
+        self.assertEqual(hash(inp_1), hash(inp_2))
+        self.assertEqual(len({inp_1, inp_2}), 1)
+
+    def test_colliding_hashes_not_equal(self):
+        inp_1 = FandangoInput.from_str(self.grammar, "cos(10)")
+        inp_2 = FandangoInput.from_str(self.grammar, "sqrt(-1)")
+        inp_2._hash = inp_1._hash
+
+        self.assertNotEqual(inp_1, inp_2)
+        self.assertEqual(len({inp_1, inp_2}), 2)
+
+    def test_from_str_batch(self):
+        grammar = CountingGrammar(self.grammar)
+        inputs = FandangoInput.from_str_batch(
+            grammar,
+            ["sqrt(-1)", "cos(10)", "sqrt(-1)"],
+            oracle=lambda inp: inp.startswith("sqrt"),
+        )
+
+        self.assertEqual(len(inputs), 2)
+        self.assertEqual(grammar.parse_calls, 2)
+        for inp in inputs:
+            expected = (
+                OracleResult.FAILING
+                if str(inp).startswith("sqrt")
+                else OracleResult.PASSING
+            )
+            self.assertEqual(inp.oracle, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
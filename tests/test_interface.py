@@ -1,9 +1,12 @@
 import unittest
 import os
+import pickle
+from unittest import mock
 
 from fandango.language.grammar import Grammar
 from fandango.constraints.base import Constraint
 
+from fdlearn.interface import fandango as interface
 from fdlearn.interface.fandango import parse, parse_constraint, parse_contents
 
 
@@ -42,6 +45,51 @@ class InterfaceTest(unittest.TestCase):
         self.assertEqual(len(constraints), 1)
         self.assertIsInstance(constraints[0], Constraint)
 
+    def test_parse_contents_cached(self):
+        """
+        Test that repeated contents are served from the cache, as copies of their own.
+        """
+        contents = self.GRAMMAR + "str(<ab>) == 'b';"
+        grammar_1, constraints_1 = parse_contents(contents)
+        grammar_2, constraints_2 = parse_contents(contents)
+        self.assertIsNot(grammar_1, grammar_2)
+        self.assertIsNot(constraints_1[0], constraints_2[0])
+        self.assertEqual(str(constraints_1[0]), str(constraints_2[0]))
+        self.assertEqual(set(grammar_1.rules), set(grammar_2.rules))
+
+        grammar_3, _ = parse_contents(contents, use_cache=False)
+        self.assertIsNot(grammar_1, grammar_3)
+
+    def test_parse_contents_unpicklable(self):
+        """
+        Test that results that cannot be pickled are parsed once per call and not cached.
+        """
+        contents = self.GRAMMAR + "str(<ab>) == 'ab';"
+        cache_size = interface._parse_contents_cached.cache_info().currsize
+        with (
+            mock.patch.object(
+                interface,
+                "pickle",
+                mock.Mock(
+                    dumps=mock.Mock(side_effect=TypeError),
+                    PicklingError=pickle.PicklingError,
+                ),
+            ),
+            mock.patch.object(
+                interface, "_parse_contents", wraps=interface._parse_contents
+            ) as parse_mock,
+        ):
+            grammar, constraints = parse_contents(contents)
+            self.assertEqual(parse_mock.call_count, 1)
+            parse_contents(contents)
+            self.assertEqual(parse_mock.call_count, 2)
+
+        self.assertIsInstance(grammar, Grammar)
+        self.assertEqual(len(constraints), 1)
+        self.assertEqual(
+            interface._parse_contents_cached.cache_info().currsize, cache_size
+        )
+
     def test_parse_constraint(self):
         """
         Test the parse_constraint function.
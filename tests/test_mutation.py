@@ -12,6 +12,7 @@ from fdlearn.refinement.mutation import (
     get_subtree,
     MutationFuzzer,
     replace_subtree,
+    ReplaceFragmentOperator,
     ReplaceRandomSubtreeOperator,
     SwapSubtreeOperator,
 )
@@ -118,6 +119,23 @@ class TestMutationFuzzer(unittest.TestCase):
         self.assertIsNotNone(new_tree, "Swap mutation should produce a new tree.")
         self.assertIsInstance(new_tree, DerivationTree)
 
+    def test_fragment_mutator(self):
+        mutation_fuzzer = MutationFuzzer(self.grammar, self.test_inputs, None)
+        trees, index = mutation_fuzzer.fragments[NonTerminal("<number>")]
+        self.assertEqual(len(trees), len(index))
+        self.assertEqual({str(tree) for tree in trees}, set(index.keys()))
+
+        mutator = ReplaceFragmentOperator(mutation_fuzzer.fragments)
+        inp = FandangoInput.from_str(self.grammar, "sqrt(-1)")
+        path = next(
+            path
+            for path, subtree in get_paths(inp.tree)
+            if subtree.symbol == NonTerminal("<number>")
+        )
+        new_tree = mutator.replace(inp.tree, path, fragments=mutation_fuzzer.fragments)
+        self.assertIsNotNone(new_tree, "Fragment mutation should produce a new tree.")
+        self.assertNotEqual(str(new_tree), str(inp.tree))
+
     def test_mutation_fuzzer_mutate(self):
         mutation_fuzzer = MutationFuzzer(self.grammar, self.test_inputs, None)
         inp = FandangoInput.from_str(self.grammar, "sqrt(-123)")
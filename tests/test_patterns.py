@@ -172,6 +172,128 @@ class TestPatternsWithPlaceholders(unittest.TestCase):
             self.assertTrue(inp.check(inp1))
             self.assertFalse(inp.check(inp2))
 
+    def test_symmetric_pattern_instantiation(self):
+        from fdlearn.learning.instantiation import NonTerminalPlaceholderTransformer
+        from fandango.language.symbol import NonTerminal
+
+        patterns = {
+            pattern.string_pattern: pattern.instantiated_pattern
+            for pattern in Pattern.registry
+        }
+        transformer = NonTerminalPlaceholderTransformer(
+            {NonTerminal("<A>"), NonTerminal("<B>"), NonTerminal("<C>")}
+        )
+
+        equal = transformer.transform(
+            patterns["int(<NON_TERMINAL>) == int(<NON_TERMINAL>);"]
+        )
+        less = transformer.transform(
+            patterns["int(<NON_TERMINAL>) < int(<NON_TERMINAL>);"]
+        )
+        self.assertEqual(len(equal), 6)
+        self.assertEqual(len(less), 9)
+
+        # Every pair of non-terminals is emitted in the same (sorted) order
+        for constraint in equal:
+            symbols = [str(search.symbol) for search in constraint.searches.values()]
+            self.assertEqual(symbols, sorted(symbols))
+
+    def test_asymmetric_pattern_instantiation(self):
+        from fdlearn.learning.instantiation import (
+            NonTerminalPlaceholderTransformer,
+            NON_TERMINAL_PLACEHOLDER,
+        )
+        from fandango.constraints.base import ComparisonConstraint, Comparison
+        from fandango.constraints import predicates
+        from fandango.language.search import RuleSearch
+        from fandango.language.symbol import NonTerminal
+
+        # Replacing the first name on the left gives the right side, but swapping both names does not
+        first, second = Pattern.get_id(1), Pattern.get_id(2)
+        pattern = ComparisonConstraint(
+            operator=Comparison.EQUAL,
+            left=f"f({first}, {second})",
+            right=f"f({second}, {second})",
+            searches={
+                first: RuleSearch(NON_TERMINAL_PLACEHOLDER),
+                second: RuleSearch(NON_TERMINAL_PLACEHOLDER),
+            },
+            local_variables=predicates.__dict__,
+            global_variables=globals(),
+        )
+        self.assertFalse(NonTerminalPlaceholderTransformer.is_symmetric(pattern))
+
+        transformer = NonTerminalPlaceholderTransformer(
+            {NonTerminal("<A>"), NonTerminal("<B>"), NonTerminal("<C>")}
+        )
+        self.assertEqual(len(transformer.transform(pattern)), 9)
+
+    def test_attribute_expansion_per_bound_non_terminal(self):
+        from fdlearn.learning.instantiation import (
+            NonTerminalPlaceholderTransformer,
+            ATTRIBUTE_PLACEHOLDER,
+        )
+        from fandango.language.search import RuleSearch
+        from fandango.language.symbol import NonTerminal
+
+        bound = NonTerminal("<elem>")
+        transformer = NonTerminalPlaceholderTransformer(
+            set(),
+            reachability_map={
+                NonTerminal("<X>"): {NonTerminal("<p>")},
+                NonTerminal("<Y>"): {NonTerminal("<q>")},
+            },
+        )
+        base_searches = {
+            "a": RuleSearch(ATTRIBUTE_PLACEHOLDER),
+            "b": RuleSearch(ATTRIBUTE_PLACEHOLDER),
+        }
+        expanded = list(
+            transformer._expand_searches(
+                base_searches,
+                {NonTerminal("<X>"): bound, NonTerminal("<Y>"): bound},
+            )
+        )
+
+        # Both placeholders are filled from the same bound non-terminal, never mixed
+        attributes = sorted(
+            tuple(str(searches[key].attribute.symbol) for key in ("a", "b"))
+            for searches in expanded
+        )
+        self.assertEqual(attributes, [("<p>", "<p>"), ("<q>", "<q>")])
+
+    def test_pattern_processor_with_workers(self):
+        from fdlearn.data import FandangoInput
+        from fdlearn.learning.instantiation import PatternProcessor, ValueMaps
+        from fandango.language.symbol import NonTerminal
+
+        grammar = """
+        <start> ::= <A> "," <B>;
+        <A> ::= <digit>+;
+        <B> ::= <digit>+;
+        <digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9";
+        """
+        grammar, _ = parse_contents(grammar)
+        inputs = {
+            FandangoInput.from_str(grammar, inp, True) for inp in ["12,3", "7,45"]
+        }
+        relevant_non_terminals = {NonTerminal("<A>"), NonTerminal("<B>")}
+        value_maps = ValueMaps(relevant_non_terminals)
+        value_maps.extract_non_terminal_values(inputs)
+        patterns = [pattern.instantiated_pattern for pattern in Pattern.registry]
+
+        sequential = PatternProcessor(patterns).instantiate_patterns(
+            relevant_non_terminals, inputs, value_maps
+        )
+        parallel = PatternProcessor(patterns, workers=2).instantiate_patterns(
+            relevant_non_terminals, inputs, value_maps
+        )
+        self.assertTrue(sequential)
+        self.assertEqual(
+            {str(candidate) for candidate in sequential},
+            {str(candidate) for candidate in parallel},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,10 +2,23 @@ import unittest
 import os
 
 from fdlearn.data import FandangoInput, OracleResult
-from fdlearn.refinement.runner import ExecutionHandler, SingleExecutionHandler, BatchExecutionHandler
+from fdlearn.refinement.runner import (
+    ExecutionHandler,
+    SingleExecutionHandler,
+    BatchExecutionHandler,
+)
 from fdlearn.interface import parse
 
 
+def failing_oracle(inp_: FandangoInput) -> OracleResult:
+    return OracleResult.FAILING
+
+
+class PassingExecutionHandler(SingleExecutionHandler):
+    def _get_label(self, test_input: FandangoInput) -> OracleResult:
+        return OracleResult.PASSING
+
+
 class TestExecutionRunner(unittest.TestCase):
 
     @classmethod
@@ -28,6 +41,39 @@ class TestExecutionRunner(unittest.TestCase):
         for inp in test_inputs:
             self.assertEqual(inp.oracle, OracleResult.FAILING)
 
+    def test_single_runner_with_workers(self):
+        inputs = ["sqrt(-1)", "cos(10)", "tan(3)", "sin(-900)"]
+        test_inputs = {FandangoInput.from_str(self.grammar, inp) for inp in inputs}
+
+        runner = SingleExecutionHandler(oracle=failing_oracle, workers=2)
+        _ = runner.label(test_inputs)
+        runner.shutdown()
+        for inp in test_inputs:
+            self.assertEqual(inp.oracle, OracleResult.FAILING)
+
+    def test_single_runner_with_workers_local_oracle(self):
+        def oracle(inp_: FandangoInput) -> OracleResult:
+            return OracleResult.PASSING
+
+        inp_1 = FandangoInput.from_str(self.grammar, "sqrt(-1)")
+        inp_2 = FandangoInput.from_str(self.grammar, "cos(10)")
+        test_inputs = {inp_1, inp_2}
+
+        runner = SingleExecutionHandler(oracle=oracle, workers=2)
+        _ = runner.label(test_inputs)
+        runner.shutdown()
+        for inp in test_inputs:
+            self.assertEqual(inp.oracle, OracleResult.PASSING)
+
+    def test_single_runner_with_workers_uses_get_label(self):
+        inputs = ["sqrt(-1)", "cos(10)", "tan(3)", "sin(-900)"]
+        test_inputs = {FandangoInput.from_str(self.grammar, inp) for inp in inputs}
+
+        with PassingExecutionHandler(oracle=failing_oracle, workers=2) as runner:
+            _ = runner.label(test_inputs)
+        self.assertIsNone(runner._pool)
+        for inp in test_inputs:
+            self.assertEqual(inp.oracle, OracleResult.PASSING)
 
     def test_batch_runner(self):
         def oracle(inp_: set[FandangoInput]) -> dict[FandangoInput, OracleResult]:
@@ -47,5 +93,5 @@ class TestExecutionRunner(unittest.TestCase):
             self.assertEqual(inp.oracle, OracleResult.FAILING)
 
 
-if __name__ == '__main__':
+if __name__ == "__main__":
     unittest.main()
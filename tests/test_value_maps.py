@@ -5,7 +5,7 @@ from fandango.language.symbol import NonTerminal
 
 from fdlearn.data.input import FandangoInput
 from fdlearn.interface.fandango import parse_file
-from fdlearn.learning.instantiation import ValueMaps
+from fdlearn.learning.instantiation import ValueMaps, parse_number
 
 
 class TestConjunctionProcessor(unittest.TestCase):
@@ -75,6 +75,46 @@ class TestConjunctionProcessor(unittest.TestCase):
             },
         )
 
+    def test_parse_number(self):
+        self.assertEqual(parse_number("-900"), -900)
+        self.assertIsInstance(parse_number("-900"), int)
+        self.assertEqual(parse_number("1.5"), 1.5)
+        self.assertEqual(parse_number("1e3"), 1000.0)
+        self.assertIsNone(parse_number("sqrt"))
+        self.assertIsNone(parse_number(""))
+        self.assertIsNone(parse_number("__import__('os')"))
+
+    def test_parse_number_kept_as_string(self):
+        self.assertIsNone(parse_number("007"))
+        self.assertIsNone(parse_number("-007"))
+        self.assertIsNone(parse_number("1" * 5000))
+        self.assertIsNone(parse_number("\u0661\u0662"))
+        self.assertEqual(parse_number("0"), 0)
+        self.assertEqual(parse_number("00"), 0)
+
+    def test_restore_binding(self):
+        number = NonTerminal("<number>")
+        bound = NonTerminal("<elem>")
+        value_map = ValueMaps({number})
+        value_map.extract_non_terminal_values(self.test_inputs)
+        filtered = value_map.get_filtered_int_values()
+
+        saved = value_map.save_binding(bound)
+        value_map.alias_int_values(bound, number)
+        self.assertEqual(filtered[bound], {3, -900})
+
+        inner = value_map.save_binding(bound)
+        value_map._int_values[bound] = {1}
+        value_map.restore_binding(bound, inner)
+        self.assertEqual(
+            value_map.get_int_values_for_non_terminal(bound), {-1, -10, -900, 3}
+        )
+        self.assertEqual(filtered[bound], {3, -900})
+
+        value_map.restore_binding(bound, saved)
+        self.assertNotIn(bound, value_map.get_int_values())
+        self.assertNotIn(bound, filtered)
+
     def test_large_input_size(self):
         test_inputs = set()
         for _ in range(1000):